@@ -3,7 +3,7 @@ from typing import Any
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import handle_api_error
 from app.core.config import get_app_settings
@@ -16,15 +16,15 @@ router = APIRouter()
 settings = get_app_settings()
 
 @router.post("/login", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db),
+async def login_access_token(
+    db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token
     """
     user_repo = UserRepository(db)
-    user = user_repo.authenticate(
+    user = await user_repo.authenticate(
         username=form_data.username,
         password=form_data.password
     )
@@ -49,9 +49,9 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_in: UserCreate
 ) -> Any:
     """
@@ -60,14 +60,14 @@ def register_user(
     user_repo = UserRepository(db)
     
     # Check if email is already registered
-    if user_repo.get_by_email(email=user_in.email):
+    if await user_repo.get_by_email(email=user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The email is already registered",
         )
     
     # Check if username already exists
-    if user_repo.get_by_username(username=user_in.username):
+    if await user_repo.get_by_username(username=user_in.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The username is already taken",
@@ -75,7 +75,7 @@ def register_user(
     
     # Create user
     try:
-        user = user_repo.create(user_in=user_in)
+        user = await user_repo.create(user_in=user_in)
         return user
     except Exception as e:
         raise HTTPException(
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Dict
 import json
 
 from app.db.session import get_db
@@ -20,16 +20,16 @@ router = APIRouter()
 settings = get_app_settings()
 logger = logging.getLogger(__name__)
 
-def get_conversation_repo(db: Session = Depends(get_db)) -> ConversationRepository:
+def get_conversation_repo(db: AsyncSession = Depends(get_db)) -> ConversationRepository:
     return ConversationRepository(db)
 
-def get_message_repo(db: Session = Depends(get_db)) -> MessageRepository:
+def get_message_repo(db: AsyncSession = Depends(get_db)) -> MessageRepository:
     return MessageRepository(db)
 
 @router.post("/complete", response_model=ChatResponse)
 async def complete_chat(
     request: ChatRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
@@ -62,7 +62,7 @@ async def complete_chat(
                 provider=provider,
                 user_id=current_user.id
             )
-            message_repo.create_message(user_message)
+            await message_repo.create_message(user_message)
             
             # 添加助手消息
             assistant_message = MessageCreate(
@@ -72,11 +72,11 @@ async def complete_chat(
                 provider=provider,
                 user_id=current_user.id
             )
-            message_repo.create_message(assistant_message)
+            await message_repo.create_message(assistant_message)
             
             # 更新对话的最后修改时间
             update_data = ConversationUpdate(title=None, provider=None, model=None)
-            conversation_repo.update_conversation(
+            await conversation_repo.update_conversation(
                 request.conversation_id,
                 update_data,
                 current_user.id
@@ -92,29 +92,29 @@ async def complete_chat(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/conversations/{conversation_id}", response_model=List[MessageBase])
+@router.get("/conversations/{conversation_id}", response_model=None)
 async def get_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Retrieve all messages for a specific conversation.
     """
-    # Verify conversation exists
+    # Load the conversation together with its messages
     conversation_repo = ConversationRepository(db)
-    conversation = conversation_repo.get_conversation(conversation_id, current_user.id)
+    conversation = await conversation_repo.get_conversation_with_messages(conversation_id, current_user.id)
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation with id {conversation_id} not found")
     
-    message_repo = MessageRepository(db)
-    messages = message_repo.get_messages_by_conversation_id(conversation_id, current_user.id)
-    return messages
+    return ORJSONResponse(
+        content=[{"role": message.role, "content": message.content} for message in conversation.messages]
+    )
 
 @router.delete("/conversations/{conversation_id}")
 async def delete_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -123,18 +123,18 @@ async def delete_conversation(
     """
     # Verify conversation exists
     conversation_repo = ConversationRepository(db)
-    conversation = conversation_repo.get_conversation(conversation_id, current_user.id)
+    conversation = await conversation_repo.get_conversation(conversation_id, current_user.id)
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation with id {conversation_id} not found")
     
     message_repo = MessageRepository(db)
-    success = message_repo.delete_conversation(conversation_id, current_user.id)
+    success = await message_repo.delete_conversation(conversation_id, current_user.id)
     
     if not success:
         raise HTTPException(status_code=404, detail=f"Messages for conversation {conversation_id} not found")
     
     # Delete the conversation itself
-    conversation_repo.delete_conversation(conversation_id, current_user.id)
+    await conversation_repo.delete_conversation(conversation_id, current_user.id)
     
     return {"status": "success", "message": f"Conversation {conversation_id} deleted"}
 
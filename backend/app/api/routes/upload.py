@@ -1,11 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from typing import List, Dict
 import os
 import uuid
-import json
+import orjson
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user, get_db
 from app.models.user import User
@@ -38,22 +38,22 @@ def save_filename_mapping(user_id: int, unique_filename: str, original_filename:
     mappings = {}
     if os.path.exists(user_metadata_file):
         try:
-            with open(user_metadata_file, "r") as f:
-                mappings = json.load(f)
-        except json.JSONDecodeError:
+            with open(user_metadata_file, "rb") as f:
+                mappings = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
             # File corrupted, recreate it
             mappings = {}
     
     # Add new mapping
     mappings[unique_filename] = {
         "original_filename": original_filename,
-        "upload_time": datetime.now().isoformat(),
+        "upload_time": datetime.now(),
         "file_type": file_type
     }
     
     # Save mapping
-    with open(user_metadata_file, "w") as f:
-        json.dump(mappings, f, ensure_ascii=False, indent=2)
+    with open(user_metadata_file, "wb") as f:
+        f.write(orjson.dumps(mappings, option=orjson.OPT_INDENT_2))
 
 # Get filename mappings function
 def get_filename_mappings(user_id: int) -> Dict:
@@ -64,16 +64,16 @@ def get_filename_mappings(user_id: int) -> Dict:
         return {}
     
     try:
-        with open(user_metadata_file, "r") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
+        with open(user_metadata_file, "rb") as f:
+            return orjson.loads(f.read())
+    except orjson.JSONDecodeError:
         return {}
 
 @router.post("/upload/document")
 async def upload_document(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Upload document file (PDF, DOCX, TXT, etc)
@@ -104,7 +104,7 @@ async def upload_document(
         # Save file information to database
         file_size = os.path.getsize(file_path)
         file_repo = FileRepository(db)
-        file_obj = file_repo.create_file(
+        file_obj = await file_repo.create_file(
             user_id=current_user.id,
             original_filename=file.filename,
             stored_filename=unique_filename,
@@ -128,7 +128,7 @@ async def upload_document(
         "stored_filename": unique_filename,
         "content_type": file.content_type,
         "size": file_size,
-        "upload_time": datetime.now().isoformat(),
+        "upload_time": datetime.now(),
         "file_path": file_path
     }
 
@@ -136,7 +136,7 @@ async def upload_document(
 async def upload_image(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Upload image file (JPG, PNG, etc)
@@ -167,7 +167,7 @@ async def upload_image(
         # Save file information to database
         file_size = os.path.getsize(file_path)
         file_repo = FileRepository(db)
-        file_obj = file_repo.create_file(
+        file_obj = await file_repo.create_file(
             user_id=current_user.id,
             original_filename=file.filename,
             stored_filename=unique_filename,
@@ -191,45 +191,47 @@ async def upload_image(
         "stored_filename": unique_filename,
         "content_type": file.content_type,
         "size": file_size,
-        "upload_time": datetime.now().isoformat(),
+        "upload_time": datetime.now(),
         "file_path": file_path
     }
 
 @router.get("/files")
 async def list_user_files(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all files uploaded by the current user
     """
     file_repo = FileRepository(db)
-    db_files = file_repo.get_files_by_user_id(current_user.id)
+    db_files = await file_repo.get_files_by_user_id(current_user.id)
     
-    user_files = []
-    for file in db_files:
-        user_files.append({
+    user_files = [
+        {
             "filename": file.stored_filename,
             "original_filename": file.original_filename,
             "type": file.file_type,
             "size": file.file_size,
-            "last_modified": file.created_at.isoformat(),
+            "last_modified": file.created_at,
             "content_type": file.content_type
-        })
+        }
+        for file in db_files
+    ]
     
-    return {"files": user_files}
+    # orjson encodes the datetimes natively, no per-row isoformat()
+    return ORJSONResponse(content={"files": user_files})
 
 @router.delete("/files/{file_id}")
 async def delete_file(
     file_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a file
     """
     file_repo = FileRepository(db)
-    file = file_repo.get_file_by_id(file_id)
+    file = await file_repo.get_file_by_id(file_id)
     
     if not file:
         raise HTTPException(
@@ -254,6 +256,6 @@ async def delete_file(
         )
     
     # Delete database record
-    file_repo.delete_file(file_id)
+    await file_repo.delete_file(file_id)
     
     return {"message": "File deleted successfully"} 
\ No newline at end of file
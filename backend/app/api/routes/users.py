@@ -1,7 +1,7 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_active_user
 from app.db.repositories.user_repository import UserRepository
@@ -12,7 +12,7 @@ from app.schemas.user import UserResponse, UserUpdate
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def read_current_user(
+async def read_current_user(
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
@@ -21,9 +21,9 @@ def read_current_user(
     return current_user
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user(
+async def update_current_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_in: UserUpdate,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -34,7 +34,7 @@ def update_current_user(
     
     # If trying to change the email, check if it already exists
     if user_in.email and user_in.email != current_user.email:
-        user = user_repo.get_by_email(email=user_in.email)
+        user = await user_repo.get_by_email(email=user_in.email)
         if user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,12 +43,12 @@ def update_current_user(
     
     # If trying to change the username, check if it already exists
     if user_in.username and user_in.username != current_user.username:
-        user = user_repo.get_by_username(username=user_in.username)
+        user = await user_repo.get_by_username(username=user_in.username)
         if user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken",
             )
     
-    user = user_repo.update(db_user=current_user, user_in=user_in)
+    user = await user_repo.update(db_user=current_user, user_in=user_in)
     return user 
\ No newline at end of file
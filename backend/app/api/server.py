@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -14,6 +15,7 @@ def create_application() -> FastAPI:
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
         docs_url="/api/docs",
+        default_response_class=ORJSONResponse,
     )
     
     # Setup CORS middleware
@@ -0,0 +1,77 @@
+import logging
+import os
+from typing import Optional
+
+from cachetools import TTLCache
+
+from app.core.config import get_app_settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+settings = get_app_settings()
+
+class ResponseCache:
+    """
+    Cache for serialized (JSON bytes) responses of read-heavy endpoints.
+    
+    Uses Redis when REDIS_URL is configured so all workers share entries,
+    otherwise an in-process TTL cache. The in-process cache is only safe with a
+    single worker: a write invalidates the entry in the handling worker alone, so
+    with local_fallback=False every lookup misses instead.
+    """
+    
+    def __init__(self, redis_url: Optional[str], ttl: int, maxsize: int = 1024, local_fallback: bool = True):
+        self.ttl = ttl
+        self._redis = None
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl) if local_fallback else None
+        
+        if redis_url:
+            if aioredis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed, using in-process cache")
+            else:
+                self._redis = aioredis.from_url(redis_url)
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None on miss"""
+        if self._redis is None:
+            return self._local.get(key) if self._local is not None else None
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            # A cache outage should degrade to a miss, not fail the request
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return None
+    
+    async def set(self, key: str, value: bytes) -> None:
+        """Store bytes under key with the configured TTL"""
+        if self._redis is None:
+            if self._local is not None:
+                self._local[key] = value
+            return
+        try:
+            await self._redis.setex(key, self.ttl, value)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+    
+    async def delete(self, key: str) -> None:
+        """Invalidate key"""
+        if self._redis is None:
+            if self._local is not None:
+                self._local.pop(key, None)
+            return
+        try:
+            await self._redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Cache delete failed for {key}: {str(e)}")
+
+def conversations_cache_key(user_id: int) -> str:
+    return f"conversations:{user_id}"
+
+# Worker count main.py starts; separate worker caches would serve stale listings
+_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+response_cache = ResponseCache(settings.REDIS_URL, settings.CACHE_TTL_SECONDS, local_fallback=_WORKERS <= 1)
\ No newline at end of file
@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     
+    # Connection pool settings
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
@@ -50,6 +57,10 @@ class Settings(BaseSettings):
     LANGCHAIN_PROJECT: Optional[str] = os.getenv("LANGCHAIN_PROJECT")
     LANGCHAIN_TRACING_V2: Optional[str] = os.getenv("LANGCHAIN_TRACING_V2")
     
+    # Cache settings (in-process cache is used when REDIS_URL is not set)
+    REDIS_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: int = 60
+    
     # MCP settings
     MCP_CONFIG_PATH: str = "app/config/mcp_tools.json"
     
@@ -3,7 +3,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.db.session import get_db
@@ -18,8 +18,8 @@ oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Get current user from JWT token
@@ -48,7 +48,7 @@ def get_current_user(
         )
     
     user_repo = UserRepository(db)
-    user = user_repo.get_by_id(token_data.user_id)
+    user = await user_repo.get_by_id(token_data.user_id)
     
     if user is None:
         raise HTTPException(
@@ -58,7 +58,7 @@ def get_current_user(
     
     return user
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     """
@@ -71,8 +71,8 @@ def get_current_active_user(
     return current_user
 
 # Optional user validation, returns None instead of raising an exception when not authenticated
-def get_optional_current_active_user(
-    db: Session = Depends(get_db), token: Optional[str] = Depends(oauth2_scheme)
+async def get_optional_current_active_user(
+    db: AsyncSession = Depends(get_db), token: Optional[str] = Depends(oauth2_scheme)
 ) -> Optional[User]:
     """
     Optional user authentication dependency
@@ -91,7 +91,7 @@ def get_optional_current_active_user(
         return None
     
     user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    user = await user_repo.get_by_id(user_id)
     
     if user is None or not user.is_active:
         return None
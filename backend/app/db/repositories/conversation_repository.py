@@ -1,17 +1,21 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.models.conversation import Conversation, ConversationType
+from app.models.message import Message
 from app.schemas.conversation import ConversationCreate, ConversationUpdate, generate_conversation_id
 from app.core.config import get_app_settings
+from app.core.cache import conversations_cache_key, response_cache
 
 settings = get_app_settings()
 
 class ConversationRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_conversation(self, conversation: ConversationCreate, user_id: int) -> Conversation:
+    async def create_conversation(self, conversation: ConversationCreate, user_id: int) -> Conversation:
         conversation_id = generate_conversation_id()
         provider = conversation.provider or settings.DEFAULT_LLM_PROVIDER
         
@@ -51,49 +55,75 @@ class ConversationRepository:
         )
         
         self.db.add(db_conversation)
-        self.db.commit()
-        self.db.refresh(db_conversation)
+        await self.db.commit()
+        await response_cache.delete(conversations_cache_key(user_id))
         return db_conversation
     
-    def get_conversation(self, conversation_id: str, user_id: Optional[int] = None) -> Optional[Conversation]:
-        query = self.db.query(Conversation).filter(Conversation.id == conversation_id)
+    async def get_conversation(self, conversation_id: str, user_id: Optional[int] = None) -> Optional[Conversation]:
+        stmt = select(Conversation).where(Conversation.id == conversation_id)
         
         if user_id is not None:
-            query = query.filter(Conversation.user_id == user_id)
+            stmt = stmt.where(Conversation.user_id == user_id)
             
-        return query.first()
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
     
-    def get_conversations_by_user_id(self, user_id: int) -> List[Conversation]:
-        return self.db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).order_by(Conversation.updated_at.desc()).all()
+    async def get_conversation_with_messages(self, conversation_id: str, user_id: int) -> Optional[Conversation]:
+        # One query for the conversation, one for its messages; any other relationship access raises
+        stmt = (
+            select(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+            .options(
+                selectinload(Conversation.messages.and_(Message.user_id == user_id)),
+                raiseload("*"),
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
     
-    def update_conversation(self, conversation_id: str, update_data: ConversationUpdate, user_id: int) -> Optional[Conversation]:
-        conversation = self.get_conversation(conversation_id, user_id)
-        
-        if not conversation:
-            return None
-        
-        # Update fields
-        if update_data.title is not None:
-            conversation.title = update_data.title
+    async def get_conversations_by_user_id(self, user_id: int) -> List[Dict[str, Any]]:
+        # Select only the listed columns and return plain dicts, skipping ORM object construction
+        result = await self.db.execute(
+            select(
+                Conversation.id,
+                Conversation.title,
+                Conversation.provider,
+                Conversation.model,
+                Conversation.conversation_type,
+                Conversation.created_at,
+            ).where(
+                Conversation.user_id == user_id
+            ).order_by(Conversation.updated_at.desc())
+        )
+        return [dict(row) for row in result.mappings()]
+    
+    async def update_conversation(self, conversation_id: str, update_data: ConversationUpdate, user_id: int) -> Optional[Dict[str, Any]]:
+        # Only overwrite the fields that were provided, but always bump updated_at
+        values = update_data.model_dump(exclude_none=True)
         
-        if update_data.provider is not None:
-            conversation.provider = update_data.provider
+        # Single UPDATE ... RETURNING instead of SELECT + flush + refresh
+        result = await self.db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+            .values(**values, updated_at=func.now())
+            .returning(*Conversation.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await self.db.commit()
+        await response_cache.delete(conversations_cache_key(user_id))
         
-        if update_data.model is not None:
-            conversation.model = update_data.model
+        if row is None:
+            return None
         
-        self.db.commit()
-        self.db.refresh(conversation)
-        return conversation
+        return dict(row._mapping)
     
-    def delete_conversation(self, conversation_id: str, user_id: int) -> bool:
-        conversation = self.get_conversation(conversation_id, user_id)
-        
-        if not conversation:
-            return False
-        
-        self.db.delete(conversation)
-        self.db.commit()
-        return True 
\ No newline at end of file
+    async def delete_conversation(self, conversation_id: str, user_id: int) -> bool:
+        result = await self.db.execute(
+            delete(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        await response_cache.delete(conversations_cache_key(user_id))
+        return result.rowcount > 0 
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.file import File
 from app.models.user import User
@@ -7,10 +8,10 @@ from app.models.user import User
 class FileRepository:
     """文件存储库"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_file(
+    async def create_file(
         self,
         user_id: int,
         original_filename: str,
@@ -31,35 +32,42 @@ class FileRepository:
             file_size=file_size
         )
         self.db.add(file_obj)
-        self.db.commit()
-        self.db.refresh(file_obj)
+        await self.db.commit()
         return file_obj
     
-    def get_file_by_id(self, file_id: int) -> Optional[File]:
+    async def get_file_by_id(self, file_id: int) -> Optional[File]:
         """通过ID获取文件"""
-        return self.db.query(File).filter(File.id == file_id).first()
+        result = await self.db.execute(select(File).where(File.id == file_id))
+        return result.scalars().first()
     
-    def get_file_by_stored_filename(self, stored_filename: str) -> Optional[File]:
+    async def get_file_by_stored_filename(self, stored_filename: str) -> Optional[File]:
         """通过存储文件名获取文件"""
-        return self.db.query(File).filter(File.stored_filename == stored_filename).first()
+        result = await self.db.execute(select(File).where(File.stored_filename == stored_filename))
+        return result.scalars().first()
     
-    def get_files_by_user_id(self, user_id: int) -> List[File]:
+    async def get_files_by_user_id(self, user_id: int) -> List[File]:
         """获取用户的所有文件"""
-        return self.db.query(File).filter(File.user_id == user_id).order_by(File.created_at.desc()).all()
+        result = await self.db.execute(
+            select(File).where(File.user_id == user_id).order_by(File.created_at.desc())
+        )
+        return result.scalars().all()
     
-    def get_files_by_user_and_type(self, user_id: int, file_type: str) -> List[File]:
+    async def get_files_by_user_and_type(self, user_id: int, file_type: str) -> List[File]:
         """获取用户的特定类型文件"""
-        return self.db.query(File).filter(
-            File.user_id == user_id,
-            File.file_type == file_type
-        ).order_by(File.created_at.desc()).all()
+        result = await self.db.execute(
+            select(File).where(
+                File.user_id == user_id,
+                File.file_type == file_type
+            ).order_by(File.created_at.desc())
+        )
+        return result.scalars().all()
     
-    def delete_file(self, file_id: int) -> bool:
+    async def delete_file(self, file_id: int) -> bool:
         """删除文件记录"""
-        file = self.get_file_by_id(file_id)
+        file = await self.get_file_by_id(file_id)
         if not file:
             return False
         
-        self.db.delete(file)
-        self.db.commit()
+        await self.db.delete(file)
+        await self.db.commit()
         return True 
\ No newline at end of file
@@ -1,14 +1,15 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.message import Message
 from app.schemas.message import MessageCreate, MessageInDB
 
 class MessageRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_message(self, message: MessageCreate) -> Message:
+    async def create_message(self, message: MessageCreate) -> Message:
         db_message = Message(
             conversation_id=message.conversation_id,
             role=message.role,
@@ -17,38 +18,30 @@ class MessageRepository:
             user_id=message.user_id
         )
         self.db.add(db_message)
-        self.db.commit()
-        self.db.refresh(db_message)
+        await self.db.commit()
         return db_message
     
-    def get_messages_by_conversation_id(self, conversation_id: str, user_id: Optional[int] = None) -> List[Message]:
-        query = self.db.query(Message).filter(
+    async def get_messages_by_conversation_id(self, conversation_id: str, user_id: Optional[int] = None) -> List[Message]:
+        stmt = select(Message).where(
             Message.conversation_id == conversation_id
         )
         
         if user_id is not None:
-            query = query.filter(Message.user_id == user_id)
+            stmt = stmt.where(Message.user_id == user_id)
             
-        return query.order_by(Message.created_at).all()
+        result = await self.db.execute(stmt.order_by(Message.created_at))
+        return result.scalars().all()
     
-    def get_message_by_id(self, message_id: int) -> Optional[Message]:
-        return self.db.query(Message).filter(Message.id == message_id).first()
+    async def get_message_by_id(self, message_id: int) -> Optional[Message]:
+        result = await self.db.execute(select(Message).where(Message.id == message_id))
+        return result.scalars().first()
     
-    def delete_conversation(self, conversation_id: str, user_id: Optional[int] = None) -> bool:
-        query = self.db.query(Message).filter(
-            Message.conversation_id == conversation_id
-        )
+    async def delete_conversation(self, conversation_id: str, user_id: Optional[int] = None) -> bool:
+        stmt = delete(Message).where(Message.conversation_id == conversation_id)
         
         if user_id is not None:
-            query = query.filter(Message.user_id == user_id)
-            
-        messages = query.all()
-        
-        if not messages:
-            return False
-        
-        for message in messages:
-            self.db.delete(message)
+            stmt = stmt.where(Message.user_id == user_id)
         
-        self.db.commit()
-        return True 
\ No newline at end of file
+        result = await self.db.execute(stmt.execution_options(synchronize_session=False))
+        await self.db.commit()
+        return result.rowcount > 0 
\ No newline at end of file
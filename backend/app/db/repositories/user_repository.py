@@ -1,25 +1,31 @@
+import asyncio
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalars().first()
     
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    async def get_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
     
-    def get_by_username(self, username: str) -> Optional[User]:
-        return self.db.query(User).filter(User.username == username).first()
+    async def get_by_username(self, username: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
     
-    def create(self, user_in: UserCreate) -> User:
-        hashed_password = get_password_hash(user_in.password)
+    async def create(self, user_in: UserCreate) -> User:
+        # bcrypt is CPU-bound; keep it off the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, user_in.password)
         db_user = User(
             email=user_in.email,
             username=user_in.username,
@@ -27,28 +33,26 @@ class UserRepository:
             is_active=True,
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
         return db_user
     
-    def update(self, db_user: User, user_in: UserUpdate) -> User:
+    async def update(self, db_user: User, user_in: UserUpdate) -> User:
         update_data = user_in.model_dump(exclude_unset=True)
         if 'password' in update_data and update_data['password']:
-            update_data['hashed_password'] = get_password_hash(update_data.pop('password'))
+            update_data['hashed_password'] = await asyncio.to_thread(get_password_hash, update_data.pop('password'))
         
         for field, value in update_data.items():
             setattr(db_user, field, value)
         
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
         return db_user
     
-    def authenticate(self, username: str, password: str) -> Optional[User]:
-        user = self.get_by_username(username)
+    async def authenticate(self, username: str, password: str) -> Optional[User]:
+        user = await self.get_by_username(username)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await asyncio.to_thread(verify_password, password, user.hashed_password):
             return None
         return user
     
@@ -39,6 +39,12 @@ is_mcp_initialized = False
 # Store configurations for lazy loading
 mcp_config_cache = None
 
+# Formatted tool list, built once per client (cleared when the client is reset)
+_tools_cache: Optional[List[Dict[str, str]]] = None
+
+# Serializes initialization so concurrent first requests share a single client
+_mcp_init_lock = asyncio.Lock()
+
 def load_mcp_config() -> Dict[str, Any]:
     """
     Load MCP configuration from config file
@@ -85,14 +91,32 @@ async def initialize_mcp(force_init: bool = False) -> bool:
     Returns:
         bool: True if initialization successful, False otherwise
     """
-    global mcp_client, mcp_agent, mcp_client_ctx, is_mcp_initialized
-    
     # Skip initialization if already done unless forced
     if is_mcp_initialized and not force_init:
         logger.info("MCP already initialized, skipping")
         return True
     
+    async with _mcp_init_lock:
+        # Another request may have finished initialization while we were waiting
+        if is_mcp_initialized and not force_init:
+            return True
+        return await _initialize_mcp_locked()
+
+async def _initialize_mcp_locked() -> bool:
+    """
+    Perform MCP initialization; must be called with _mcp_init_lock held
+    
+    Returns:
+        bool: True if initialization successful, False otherwise
+    """
+    global mcp_client, mcp_agent, mcp_client_ctx, is_mcp_initialized, _tools_cache
+    
     logger.info("Starting MCP assistant initialization")
+    _tools_cache = None
+    
+    # A forced re-initialization must not leave the previous client's tool subprocesses running
+    if mcp_client_ctx:
+        await cleanup_mcp()
     
     try:
         # Load tool configuration
@@ -112,6 +136,17 @@ async def initialize_mcp(force_init: bool = False) -> bool:
                 logger.error(f"Invalid configuration for tool {tool_name}: not a dictionary")
                 continue
                 
+            # Tools already running as sse servers are reached by URL, no subprocess needed
+            if tool_config.get("transport") == "sse":
+                if "url" not in tool_config:
+                    logger.error(f"Invalid configuration for tool {tool_name}: sse transport needs a url")
+                    continue
+                filtered_config[tool_name] = {
+                    "url": tool_config["url"],
+                    "transport": "sse"
+                }
+                continue
+                
             if "args" not in tool_config:
                 logger.warning(f"Tool {tool_name} has no args configuration")
                 continue
@@ -136,7 +171,9 @@ async def initialize_mcp(force_init: bool = False) -> bool:
                     logger.info(f"Updated {tool_name} path to: {abs_path}")
         
         # Create MultiServerMCPClient (following example implementation)
-        logger.info(f"Creating MultiServerMCPClient with configuration: {json.dumps(filtered_config, indent=2)}")
+        logger.info(f"Creating MultiServerMCPClient for tools: {list(filtered_config)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"MultiServerMCPClient configuration: {json.dumps(filtered_config, indent=2)}")
         
         # Initialize client in a separate task to avoid context issues
         async def init_client():
@@ -160,6 +197,9 @@ async def initialize_mcp(force_init: bool = False) -> bool:
         tool_names = [tool.name for tool in tools]
         logger.info(f"Available tools: {tool_names}")
         
+        # Format the tool list once here instead of on every /tools request
+        _tools_cache = _format_tools(tools)
+        
         # Get LLM model
         llm_service = LLMService()
         provider = settings.DEFAULT_LLM_PROVIDER
@@ -200,7 +240,8 @@ async def initialize_mcp(force_init: bool = False) -> bool:
 
 async def cleanup_mcp() -> None:
     """Clean up MCP client resources"""
-    global mcp_client, mcp_client_ctx, is_mcp_initialized
+    global mcp_client, mcp_client_ctx, is_mcp_initialized, _tools_cache
+    _tools_cache = None
     if mcp_client_ctx:
         logger.info("Cleaning up MCP resources")
         try:
@@ -462,6 +503,18 @@ async def _fallback_stream(request: ChatRequest) -> StreamingResponse:
         media_type="text/event-stream"
     )
 
+def _format_tools(tools: List[Any]) -> List[Dict[str, str]]:
+    """
+    Build the tool listing returned by the tools endpoint
+    
+    Args:
+        tools: Tools returned by the MCP client
+        
+    Returns:
+        List of name/description dictionaries
+    """
+    return [{"name": tool.name, "description": tool.description} for tool in tools]
+
 async def get_available_tools() -> Dict[str, List[Dict[str, str]]]:
     """
     Get list of available MCP tools
@@ -469,7 +522,7 @@ async def get_available_tools() -> Dict[str, List[Dict[str, str]]]:
     Returns:
         Dict with list of tools
     """
-    global mcp_client
+    global mcp_client, _tools_cache
     
     # Try to load from config if client not available
     if not mcp_client:
@@ -485,18 +538,15 @@ async def get_available_tools() -> Dict[str, List[Dict[str, str]]]:
         
         return {"tools": tools}
     
+    # Tool list precomputed during initialization
+    if _tools_cache is not None:
+        return {"tools": _tools_cache}
+    
     # Get tools from client if available
     try:
         tools = mcp_client.get_tools()
-        tool_list = []
-        
-        for tool in tools:
-            tool_list.append({
-                "name": tool.name,
-                "description": tool.description
-            })
-        
-        return {"tools": tool_list}
+        _tools_cache = _format_tools(tools)
+        return {"tools": _tools_cache}
     except Exception as e:
         logger.error(f"Error getting available tools: {str(e)}", exc_info=True)
         return {"tools": []}
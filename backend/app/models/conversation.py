@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 import enum
 
 from app.db.session import Base
@@ -10,6 +11,8 @@ class ConversationType(str, enum.Enum):
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    # Load server defaults (timestamps) from the INSERT itself so callers need no refresh()
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String, primary_key=True, index=True)
     title = Column(String, nullable=True)
@@ -20,5 +23,15 @@ class Conversation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Messages are not linked by a foreign key, so the join is declared explicitly.
+    # lazy="raise" forces callers to eager load instead of silently issuing N+1 queries.
+    messages = relationship(
+        "Message",
+        primaryjoin="Conversation.id == foreign(Message.conversation_id)",
+        order_by="Message.created_at",
+        lazy="raise",
+        viewonly=True,
+    )
+    
     def __repr__(self):
         return f"<Conversation id={self.id}, title={self.title}, type={self.conversation_type}>" 
\ No newline at end of file
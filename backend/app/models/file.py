@@ -7,6 +7,7 @@ from app.db.session import Base
 class File(Base):
     """File upload record model"""
     __tablename__ = "files"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     original_filename = Column(String, index=True, nullable=False)
@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from app.db.session import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Covers "messages of a conversation ordered by time" without a separate sort
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(String, index=True)
+    conversation_id = Column(String)
     role = Column(String, nullable=False)  # 'user', 'assistant', 'system'
     content = Column(Text, nullable=False)
     provider = Column(String, nullable=True)  # 'openai', 'google', 'anthropic', 'nvidia'
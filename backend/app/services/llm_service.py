@@ -43,14 +43,19 @@ class LLMService:
     """Service to handle interactions with various LLM providers."""
     
     @staticmethod
-    @lru_cache(maxsize=None)
     def get_provider(provider_name: Optional[str] = None, model_name: Optional[str] = None, streaming: bool = False):
         """Factory method to get LLM provider with caching."""
+        # Resolve the default first so None and the explicit default share one cached instance
+        provider_name = provider_name or os.getenv("DEFAULT_LLM_PROVIDER", "openai")
+        return LLMService._get_cached_provider(provider_name, model_name, streaming)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_cached_provider(provider_name: str, model_name: Optional[str], streaming: bool):
+        """Create the provider for a resolved name, once per argument combination."""
         try:
             setup_langchain_tracing()
             
-            provider_name = provider_name or os.getenv("DEFAULT_LLM_PROVIDER", "openai")
-            
             # Try the requested provider first
             try:
                 return LLMService._create_provider(provider_name, model_name, streaming)
@@ -5,6 +5,7 @@ LangChain MCP Client - A client that integrates multiple tool servers
 import os
 import json
 import logging
+import orjson
 from typing import Dict, List, Any, Optional, Callable
 import asyncio
 import subprocess
@@ -39,6 +40,9 @@ class MCPClient:
         self.config_path = config_path
         self.tools_config = {}
         self.processes = {}
+        # One lock per stdio tool: a process serves one request at a time, while
+        # calls to different tools can still run concurrently
+        self._stdio_locks: Dict[str, asyncio.Lock] = {}
         self._load_config()
         
     def _load_config(self):
@@ -104,7 +108,9 @@ class MCPClient:
         transport = tool_config.get("transport")
         
         if transport == "stdio":
-            return await self._invoke_stdio_tool(tool_id, tool_config, query)
+            lock = self._stdio_locks.setdefault(tool_id, asyncio.Lock())
+            async with lock:
+                return await self._invoke_stdio_tool(tool_id, tool_config, query)
         elif transport == "http":
             return await self._invoke_http_tool(tool_id, tool_config, query)
         else:
@@ -142,8 +148,8 @@ class MCPClient:
         
         try:
             # Send query to the tool process
-            query_json = json.dumps({"query": query}) + "\n"
-            logger.info(f"Sending query to tool: {query_json.strip()}")
+            query_json = orjson.dumps({"query": query}) + b"\n"
+            logger.info(f"Sending query to tool: {query_json[:-1].decode()}")
             
             if process.stdin.is_closing():
                 logger.error(f"Process stdin is closed, restarting process")
@@ -158,7 +164,7 @@ class MCPClient:
                 del self.processes[tool_id]
                 return await self._invoke_stdio_tool(tool_id, config, query)
             
-            process.stdin.write(query_json.encode())
+            process.stdin.write(query_json)
             await process.stdin.drain()
             
             # Read tool response with timeout
@@ -168,7 +174,7 @@ class MCPClient:
                 logger.info(f"Received response from tool: {response_text}")
                 
                 try:
-                    response_json = json.loads(response_text)
+                    response_json = orjson.loads(response_text)
                     result = response_json.get("result", "")
                     error = response_json.get("error")
                     
@@ -177,7 +183,7 @@ class MCPClient:
                         return f"Error: {error}"
                     
                     return result
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.error(f"Failed to parse JSON response from tool '{tool_id}': {response_text}")
                     return f"Error parsing tool response: {response_text}"
             except asyncio.TimeoutError:
@@ -220,7 +226,7 @@ class MCPClient:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
                     url,
-                    json={"query": query},
+                    content=orjson.dumps({"query": query}),
                     headers=headers,
                     timeout=30.0
                 )
@@ -230,7 +236,7 @@ class MCPClient:
                     return f"Error: HTTP tool returned status code {response.status_code}"
                 
                 try:
-                    response_json = response.json()
+                    response_json = orjson.loads(response.content)
                     result = response_json.get("result", "")
                     error = response_json.get("error")
                     
@@ -239,7 +245,7 @@ class MCPClient:
                         return f"Error: {error}"
                     
                     return result
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.error(f"Failed to parse JSON response from HTTP tool '{tool_id}'")
                     return f"Error parsing HTTP tool response: {response.text}"
         except Exception as e:
@@ -295,9 +301,19 @@ class MCPClient:
             logger.info(f"Shutting down tool process '{tool_id}'")
             try:
                 process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=5.0)
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    # Escalate so a hung tool does not outlive the client
+                    logger.warning(f"Tool process '{tool_id}' did not exit after SIGTERM, killing it")
+                    process.kill()
+                    await process.wait()
+            except ProcessLookupError:
+                # Process already exited
+                pass
             except Exception as e:
                 logger.error(f"Error shutting down tool process '{tool_id}': {e}", exc_info=True)
+        self.processes.clear()
 
 class MCPAssistant:
     """
@@ -1,4 +1,17 @@
+import os
 import uvicorn
 
+# Auto-reload in development; otherwise run WEB_CONCURRENCY worker processes.
+# uvicorn picks uvloop and httptools automatically when they are installed.
+RELOAD = os.getenv("ENV", "dev") == "dev"
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
 if __name__ == "__main__":
-    uvicorn.run("app.api.server:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run(
+        "app.api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=RELOAD,
+        workers=None if RELOAD else WORKERS,
+        proxy_headers=True
+    ) 
\ No newline at end of file
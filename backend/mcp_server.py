@@ -5,7 +5,8 @@ using LangChain MCP adapters
 """
 import logging
 import os
-import json
+import re
+import orjson
 from typing import List, Optional, Dict, Any
 
 import uvicorn
@@ -44,10 +45,20 @@ app.add_middleware(
 # MCP client and agent
 mcp_client = None
 mcp_agent = None
+# Tool listing built at startup; the tool set is fixed for the client's lifetime
+tool_info_response = None
 
 # Get application settings
 settings = get_app_settings()
 
+# Server-sent event framing for /api/v1/mcp/stream, as bytes around orjson payloads
+SSE_DATA_PREFIX = b"data: "
+SSE_EVENT_END = b"\n\n"
+SSE_DONE = b"data: [DONE]\n\n"
+
+# A <think> block, or a lone <think> tag when the block is not closed in the chunk
+THINK_BLOCK_PATTERN = re.compile(r"<think>(?:.*?</think>)?", re.DOTALL)
+
 # Request and response models
 class Message(BaseModel):
     role: str
@@ -69,30 +80,43 @@ class ChatResponse(BaseModel):
     message: str
     tool_info: Optional[Dict[str, Any]] = None
 
+def build_tool_info_response(tools) -> ToolInfoResponse:
+    """Describe MCP tools for the tool listing endpoint"""
+    return ToolInfoResponse(tools=[
+        ToolInfo(
+            id=tool.name,
+            name=tool.name.capitalize(),
+            description=tool.description,
+            transport="mcp"
+        )
+        for tool in tools
+    ])
+
 def load_mcp_config():
     """Load MCP tool configuration from JSON file"""
-    config_path = os.path.join(os.getcwd(), "app/config/mcp_tools.json")
+    cwd = os.getcwd()
+    config_path = os.path.join(cwd, "app/config/mcp_tools.json")
     if not os.path.exists(config_path):
         logger.warning(f"MCP config file not found at {config_path}")
         # Create basic default config
         config = {
             "math": {
                 "command": "python",
-                "args": [os.path.join(os.getcwd(), "app/tools/math/math_server.py")],
+                "args": [os.path.join(cwd, "app/tools/math/math_server.py")],
                 "transport": "stdio",
                 "description": "Solves mathematical expressions and equations"
             }
         }
     else:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = orjson.loads(f.read())
             
         # Update paths to be absolute
-        for tool_id, tool_config in config.items():
-            if "args" in tool_config and len(tool_config["args"]) > 0:
+        for tool_config in config.values():
+            if tool_config.get("args"):
                 # If path is relative, make it absolute
                 if not os.path.isabs(tool_config["args"][0]):
-                    tool_config["args"][0] = os.path.join(os.getcwd(), tool_config["args"][0])
+                    tool_config["args"][0] = os.path.join(cwd, tool_config["args"][0])
     
     logger.info(f"Loaded MCP config: {config}")
     return config
@@ -100,20 +124,21 @@ def load_mcp_config():
 @app.on_event("startup")
 async def startup_event():
     """Initialize MCP client when server starts"""
-    global mcp_client, mcp_agent
+    global mcp_client, mcp_agent, tool_info_response
     try:
         logger.info("Starting MCP assistant initialization")
         
         # Load tool configuration
         mcp_config = load_mcp_config()
         
-        # Report tool paths
-        for tool_id, config in mcp_config.items():
-            tool_path = config["args"][0] if "args" in config and len(config["args"]) > 0 else None
-            if tool_path:
-                logger.info(f"Tool '{tool_id}' path: {tool_path}, exists: {os.path.exists(tool_path)}")
-        
-        logger.info(f"Current working directory: {os.getcwd()}")
+        # Report tool paths (a missing script also fails loudly when its subprocess starts)
+        if logger.isEnabledFor(logging.DEBUG):
+            for tool_id, config in mcp_config.items():
+                if config.get("args"):
+                    tool_path = config["args"][0]
+                    logger.debug(f"Tool '{tool_id}' path: {tool_path}, exists: {os.path.exists(tool_path)}")
+            
+            logger.debug(f"Current working directory: {os.getcwd()}")
         
         # Initialize MCP client
         mcp_client = MultiServerMCPClient(mcp_config)
@@ -142,7 +167,9 @@ async def startup_event():
             )
         
         # Initialize the agent with tools from MCP client
-        mcp_agent = create_react_agent(model, mcp_client.get_tools())
+        tools = mcp_client.get_tools()
+        mcp_agent = create_react_agent(model, tools)
+        tool_info_response = build_tool_info_response(tools)
         
         logger.info("MCP assistant initialization completed successfully")
     except Exception as e:
@@ -166,23 +193,14 @@ async def root():
 @app.get("/api/v1/mcp/tools", response_model=ToolInfoResponse)
 async def list_tools():
     """List all available MCP tools"""
-    global mcp_client
+    global mcp_client, tool_info_response
     if not mcp_client:
         raise HTTPException(status_code=500, detail="MCP client not initialized")
     
     try:
-        tools = mcp_client.get_tools()
-        tool_infos = []
-        
-        for tool in tools:
-            tool_infos.append(ToolInfo(
-                id=tool.name,
-                name=tool.name.capitalize(),
-                description=tool.description,
-                transport="mcp"
-            ))
-        
-        return ToolInfoResponse(tools=tool_infos)
+        if tool_info_response is None:
+            tool_info_response = build_tool_info_response(mcp_client.get_tools())
+        return tool_info_response
     except Exception as e:
         logger.error(f"Error listing tools: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to list tools: {str(e)}")
@@ -333,25 +351,21 @@ async def stream_chat(request: MCPChatRequest):
                 
                 # 清理思考标签
                 if '<think>' in clean_result:
-                    think_parts = clean_result.split('<think>')
-                    for i in range(1, len(think_parts)):
-                        if '</think>' in think_parts[i]:
-                            think_parts[i] = think_parts[i].split('</think>', 1)[1]
-                    clean_result = ''.join(think_parts)
+                    clean_result = THINK_BLOCK_PATTERN.sub('', clean_result)
                 
                 # 修正错误的换行符
                 clean_result = clean_result.replace('/n', '\n')
                 
                 # 发送干净的内容块
                 if clean_result:
-                    yield f"data: {json.dumps({'content': clean_result})}\n\n"
+                    yield SSE_DATA_PREFIX + orjson.dumps({'content': clean_result}) + SSE_EVENT_END
             
             # 发送结束事件
-            yield "data: [DONE]\n\n"
+            yield SSE_DONE
         except Exception as e:
             logger.error(f"Error in streaming chat: {str(e)}", exc_info=True)
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
-            yield "data: [DONE]\n\n"
+            yield SSE_DATA_PREFIX + orjson.dumps({'error': str(e)}) + SSE_EVENT_END
+            yield SSE_DONE
     
     return StreamingResponse(
         generate(),
@@ -365,4 +379,14 @@ async def stream_chat(request: MCPChatRequest):
 
 # If this file is run directly, start the server
 if __name__ == "__main__":
-    uvicorn.run("mcp_server:app", host="0.0.0.0", port=8001, reload=True) 
\ No newline at end of file
+    # Each worker owns one MCP client with its own stdio tool subprocesses; to share
+    # tools across workers, run them as sse servers and point mcp_tools.json at them
+    reload = os.getenv("ENV", "dev") == "dev"
+    uvicorn.run(
+        "mcp_server:app",
+        host="0.0.0.0",
+        port=8001,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        proxy_headers=True
+    ) 
\ No newline at end of file
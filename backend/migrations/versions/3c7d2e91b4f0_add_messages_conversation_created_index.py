@@ -0,0 +1,28 @@
+"""add messages (conversation_id, created_at) index
+
+Revision ID: 3c7d2e91b4f0
+Revises: a0b25f4e6721
+Create Date: 2025-04-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d2e91b4f0'
+down_revision: Union[str, None] = 'a0b25f4e6721'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'], unique=False)
+    # The composite index's leading column makes the single-column index redundant
+    op.drop_index(op.f('ix_messages_conversation_id'), table_name='messages', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_messages_conversation_id'), 'messages', ['conversation_id'], unique=False)
+    op.drop_index('ix_messages_conversation_created', table_name='messages')
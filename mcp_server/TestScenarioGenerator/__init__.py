@@ -9,6 +9,15 @@ import sys
 import os
 import logging
 
+import anyio
+
+# uvloop is optional; it speeds up the stdio and HTTP I/O the tools spend their time on
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,9 +61,9 @@ def main():
         logger.info(f"API Base URL: {os.getenv('API_BASE_URL', 'http://localhost:8000')}")
         logger.info(f"Upload Directory: {os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'uploads', 'documents'))}")
         
-        # Start the MCP server
-        logger.info("Starting MCP server...")
-        mcp.run(transport="stdio")
+        # Start the MCP server (same as mcp.run(transport="stdio"), but on uvloop when available)
+        logger.info(f"Starting MCP server (uvloop: {UVLOOP_AVAILABLE})...")
+        anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": UVLOOP_AVAILABLE})
     except Exception as e:
         logger.error(f"Error starting MCP server: {str(e)}")
         sys.exit(1)
@@ -1,7 +1,16 @@
 import os
-import json
+import re
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 # Langchain imports for version 0.3.x
@@ -12,6 +21,13 @@ from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 
+# HTTP/2 support for httpx is optional (installed via httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -36,6 +52,367 @@ DEFAULT_ANTHROPIC_MODEL = os.getenv("TEST_GENERATOR_DEFAULT_ANTHROPIC_MODEL", "c
 # LLM Parameters
 LLM_TEMPERATURE = float(os.getenv("TEST_GENERATOR_LLM_TEMPERATURE", "0.2"))
 LLM_REQUEST_TIMEOUT = int(os.getenv("TEST_GENERATOR_LLM_REQUEST_TIMEOUT", "60"))
+# Retries for rate-limited (429) and 5xx responses; the provider SDKs back off
+# exponentially with jitter and honour Retry-After
+LLM_MAX_RETRIES = int(os.getenv("TEST_GENERATOR_LLM_MAX_RETRIES", "5"))
+
+# HTTP connection pool limits (raise for large concurrent scenario batches)
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("TEST_GENERATOR_LLM_POOL_MAX_CONNECTIONS", "200"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("TEST_GENERATOR_LLM_POOL_MAX_KEEPALIVE", "100"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("TEST_GENERATOR_LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("TEST_GENERATOR_LLM_CONNECT_TIMEOUT", "10"))
+
+# Client-side request rate limits per provider (requests per minute, 0 = unlimited);
+# set to the account's limit so bursts are paced instead of answered with 429s
+PROVIDER_RPM = {
+    "openai": int(os.getenv("TEST_GENERATOR_OPENAI_RPM", "0")),
+    "google": int(os.getenv("TEST_GENERATOR_GOOGLE_RPM", "0")),
+    "anthropic": int(os.getenv("TEST_GENERATOR_ANTHROPIC_RPM", "0")),
+}
+
+# Process-wide cap on LLM requests in flight, shared by every provider and tool
+LLM_MAX_CONCURRENCY = int(os.getenv("TEST_GENERATOR_LLM_MAX_CONCURRENCY", "48"))
+_LLM_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+# Response cache: identical prompts to the same model return the stored scenarios. Entries
+# are orjson-encoded and decoded per hit, so callers can't mutate the cached objects.
+LLM_CACHE_TTL = int(os.getenv("TEST_GENERATOR_LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAXSIZE = int(os.getenv("TEST_GENERATOR_LLM_CACHE_MAXSIZE", "512"))
+
+_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=LLM_CACHE_MAXSIZE, ttl=LLM_CACHE_TTL)
+
+# Requests currently being generated, so concurrent duplicates await one LLM call
+_IN_FLIGHT: Dict[str, asyncio.Task] = {}
+
+# Prompts built from API specs, keyed by (id(spec), path, method). Each entry holds a
+# reference to its spec so the id cannot be reused by another object while cached.
+PROMPT_CACHE_MAXSIZE = int(os.getenv("TEST_GENERATOR_PROMPT_CACHE_MAXSIZE", "256"))
+_PROMPT_CACHE: "OrderedDict[Tuple[int, str, str], Tuple[Dict[str, Any], str]]" = OrderedDict()
+
+# System prompt sent with every scenario generation request
+SYSTEM_PROMPT = "You are a QA engineer specializing in API testing, skilled at creating comprehensive test scenarios. Please respond with valid JSON."
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+# Output instructions appended to a single-endpoint scenario prompt
+_SCENARIO_INSTRUCTIONS = """
+
+Please create comprehensive test scenarios for this API, including positive tests, negative tests, boundary tests, etc.
+For each scenario, provide the following information:
+1. Scenario name
+2. Scenario description
+3. Preconditions
+4. Test steps
+5. Expected results
+6. Request parameters/examples (JSON format)
+7. Test priority (P0-P3)
+8. Applicable environments
+
+Based on the API specification above, please return 5-10 test scenarios in the following JSON format:
+
+```json
+[
+  {
+    "name": "Scenario name",
+    "description": "Scenario description",
+    "preconditions": "Preconditions",
+    "steps": ["Step 1", "Step 2", "..."],
+    "expected_result": "Expected result",
+    "request_example": {},
+    "priority": "P0-P3",
+    "environment": ["Development", "Testing", "Production"]
+  }
+]
+```
+
+Please ensure the scenarios are comprehensive and focus on potential security issues, performance considerations, and boundary conditions.
+"""
+
+# Output instructions appended to a multi-endpoint (batched) scenario prompt
+_BATCH_SCENARIO_INSTRUCTIONS = """
+
+Please create comprehensive test scenarios for each interface above, including positive tests, negative tests, boundary tests, etc.
+For each interface, return 5-10 test scenarios. Respond with a single JSON object whose keys are the interface
+headings exactly as written above (for example "GET /users/{id}") and whose values are arrays of scenarios:
+
+```json
+{
+  "GET /example": [
+    {
+      "name": "Scenario name",
+      "description": "Scenario description",
+      "preconditions": "Preconditions",
+      "steps": ["Step 1", "Step 2", "..."],
+      "expected_result": "Expected result",
+      "request_example": {},
+      "priority": "P0-P3",
+      "environment": ["Development", "Testing", "Production"]
+    }
+  ]
+}
+```
+
+Please ensure the scenarios are comprehensive and focus on potential security issues, performance considerations, and boundary conditions.
+"""
+
+# Default number of concurrent per-endpoint LLM calls in generate_test_scenarios_many
+LLM_CONCURRENCY = int(os.getenv("TEST_GENERATOR_LLM_CONCURRENCY", "32"))
+
+# Upper bound on endpoint descriptions per batched prompt (~4 characters per token)
+BATCH_MAX_PROMPT_CHARS = int(os.getenv("TEST_GENERATOR_BATCH_MAX_PROMPT_CHARS", "200000"))
+
+def _endpoint_key(api_path: str, method: str) -> str:
+    """Key identifying an endpoint in batched prompts and results"""
+    return f"{method.upper()} {api_path}"
+
+# Markdown code fence around a JSON body, possibly after some prose (closing fence
+# optional for truncated output)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+
+# Flat JSON objects embedded in free text, tried when the body itself isn't JSON
+_JSON_OBJECT_RE = re.compile(r"\{[^{}]*\}")
+
+# Wrapper keys models put the scenario list under, in priority order
+_SCENARIO_KEYS = ("test_scenarios", "scenarios", "testcases")
+
+def _extract_scenario_list(parsed: Any) -> Optional[List[Any]]:
+    """Return the scenario list from a parsed response, or None if it contains none"""
+    if isinstance(parsed, list):
+        return parsed
+    if not isinstance(parsed, dict):
+        return None
+    for key in _SCENARIO_KEYS:
+        if key in parsed:
+            return parsed[key]
+    # Otherwise take the first list value in the object
+    for value in parsed.values():
+        if isinstance(value, list):
+            return value
+    return None
+
+def _strip_fence(content: str) -> str:
+    """Return the body of a markdown code fence, or the content itself if there is none"""
+    # No strip needed: orjson ignores surrounding whitespace
+    match = _FENCE_RE.search(content)
+    return match.group(1) if match else content
+
+def _parse_scenarios(content: str) -> List[Dict[str, Any]]:
+    """
+    Parse test scenarios from raw LLM output
+    
+    Args:
+        content: Response text, optionally wrapped in a markdown code fence
+        
+    Returns:
+        List of scenarios; free text is wrapped as a single scenario
+    """
+    content = _strip_fence(content)
+    
+    try:
+        parsed = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # Try each JSON object embedded in the text until one holds a list
+        for candidate in _JSON_OBJECT_RE.findall(content):
+            try:
+                scenarios = _extract_scenario_list(orjson.loads(candidate))
+            except orjson.JSONDecodeError:
+                continue
+            if scenarios is not None:
+                return scenarios
+        
+        # If no valid JSON found, create a structured format from the text
+        return [{
+            "name": "Generated Scenario",
+            "description": content.strip(),
+            "steps": []
+        }]
+    
+    scenarios = _extract_scenario_list(parsed)
+    return scenarios if scenarios is not None else []
+
+# Tokens that matter while scanning a streamed object, outside and inside JSON strings
+_OBJECT_TOKEN_RE = re.compile(r'["{}]')
+_STRING_TOKEN_RE = re.compile(r'["\\]')
+_ELEMENT_GAP_RE = re.compile(r'[\s,]*')
+
+class _ScenarioStreamParser:
+    """
+    Incrementally extract scenario objects from a streamed JSON array
+    
+    Objects are returned as soon as their closing brace arrives. Parsing stops
+    at the end of the array or at the first element that isn't an object (or
+    isn't valid JSON). Each character is scanned once and only the unparsed
+    tail is kept, so work stays linear in the response size.
+    """
+    
+    def __init__(self):
+        self._chunks: List[str] = []  # whole response, for the non-streamable fallback
+        self._pending = ""  # unparsed tail of the response
+        self._scan_pos = 0  # index in _pending where scanning resumes
+        self._object_start: Optional[int] = None  # index in _pending of the open object
+        self._depth = 0
+        self._in_string = False
+        self._started = False  # array's opening bracket seen
+        self._done = False
+    
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return "".join(self._chunks)
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Append a chunk and return the scenario objects completed by it"""
+        self._chunks.append(chunk)
+        if self._done:
+            return []
+        
+        text = self._pending + chunk
+        pos = self._scan_pos
+        items = []
+        while pos < len(text):
+            if not self._started:
+                start = text.find("[", pos)
+                if start == -1:
+                    pos = len(text)
+                    break
+                self._started = True
+                pos = start + 1
+            elif self._object_start is None:
+                # Between elements: skip separators up to the next object
+                pos = _ELEMENT_GAP_RE.match(text, pos).end()
+                if pos >= len(text):
+                    break
+                if text[pos] != "{":
+                    self._done = True
+                    break
+                self._object_start = pos
+            elif self._in_string:
+                match = _STRING_TOKEN_RE.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                if match.group() == "\\":
+                    # Skip the escaped character (it may not have arrived yet)
+                    pos = match.end() + 1
+                else:
+                    self._in_string = False
+                    pos = match.end()
+            else:
+                match = _OBJECT_TOKEN_RE.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                pos = match.end()
+                token = match.group()
+                if token == '"':
+                    self._in_string = True
+                elif token == "{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        try:
+                            items.append(orjson.loads(text[self._object_start:pos]))
+                        except orjson.JSONDecodeError:
+                            self._done = True
+                            break
+                        self._object_start = None
+        
+        # Keep only what is still needed: the open object, or nothing between elements
+        if self._done:
+            self._pending, self._scan_pos = "", 0
+        else:
+            cut = self._object_start if self._object_start is not None else min(pos, len(text))
+            self._pending = text[cut:]
+            self._scan_pos = pos - cut
+            if self._object_start is not None:
+                self._object_start = 0
+        return items
+
+# Shared HTTP client so keep-alive connections are reused across LLM calls
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Event loop the shared client, semaphore and providers belong to; pooled connections
+# and asyncio primitives can't be used from another loop (e.g. per-test loops)
+_BOUND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def _check_event_loop() -> None:
+    """Drop the loop-bound shared state when called from a different event loop"""
+    global _BOUND_LOOP, _HTTP_CLIENT, _LLM_SEMAPHORE
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if loop is _BOUND_LOOP:
+        return
+    if _BOUND_LOOP is not None:
+        # The old loop's connections can't be closed from here; let them be collected
+        _HTTP_CLIENT = None
+        _LLM_SEMAPHORE = None
+        _PROVIDER_CACHE.clear()
+        _IN_FLIGHT.clear()
+    _BOUND_LOOP = loop
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use"""
+    global _HTTP_CLIENT
+    _check_event_loop()
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        # HTTP/2 multiplexes concurrent requests to the same provider over one connection
+        _HTTP_CLIENT = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY
+            )
+        )
+    return _HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared HTTP client (call on server shutdown)"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+    # Cached providers hold the closed client; rebuild them with the next one
+    _PROVIDER_CACHE.clear()
+
+def clear_response_cache() -> int:
+    """Drop all cached LLM responses and prompts, returning the number of responses removed"""
+    count = len(_RESPONSE_CACHE)
+    _RESPONSE_CACHE.clear()
+    _PROMPT_CACHE.clear()
+    return count
+
+# Display name, API key and its env var per provider, used by the key checks and error messages
+_PROVIDER_KEYS: Dict[str, Tuple[str, str, str]] = {
+    "openai": ("OpenAI", OPENAI_API_KEY, "TEST_GENERATOR_OPENAI_API_KEY"),
+    "google": ("Google", GOOGLE_API_KEY, "TEST_GENERATOR_GOOGLE_API_KEY"),
+    "anthropic": ("Anthropic", ANTHROPIC_API_KEY, "TEST_GENERATOR_ANTHROPIC_API_KEY"),
+}
+
+# Status codes the provider SDKs report for a rejected API key
+_AUTH_ERROR_STATUSES = (401, 403)
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent LLM requests, creating it on first use"""
+    global _LLM_SEMAPHORE
+    _check_event_loop()
+    if _LLM_SEMAPHORE is None:
+        _LLM_SEMAPHORE = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _LLM_SEMAPHORE
+
+@lru_cache(maxsize=None)
+def _check_api_key(provider: str) -> None:
+    """Check that the API key for a provider is configured (validated once per provider)"""
+    if provider not in _PROVIDER_KEYS:
+        return
+    name, api_key, env_var = _PROVIDER_KEYS[provider]
+    if not api_key:
+        raise ValueError(f"{name} API key not configured. Please set {env_var} in .env file. Current value: {api_key}")
+    if api_key == f"your_{provider}_api_key_here":
+        raise ValueError(f"{name} API key is using default value. Please set a valid {env_var} in .env file.")
 
 class LLMProvider:
     """Class to handle different LLM provider interactions using Langchain"""
@@ -51,36 +428,21 @@ class LLMProvider:
         self.provider = provider.lower() if provider else DEFAULT_LLM_PROVIDER
         self._check_api_keys()
         self._initialize_models()
+        # Static per-provider call options, built once (provider may have fallen back above)
+        self._call_kwargs = self._invoke_kwargs()
+        rpm = PROVIDER_RPM.get(self.provider, 0)
+        self._limiter = AsyncLimiter(rpm, 60) if rpm > 0 else None
     
     def _check_api_keys(self):
         """Check if the required API keys are available"""
-        if self.provider == "openai" and not OPENAI_API_KEY:
-            raise ValueError(f"OpenAI API key not configured. Please set TEST_GENERATOR_OPENAI_API_KEY in .env file. Current value: {OPENAI_API_KEY}")
-        elif self.provider == "openai" and OPENAI_API_KEY == "your_openai_api_key_here":
-            raise ValueError("OpenAI API key is using default value. Please set a valid TEST_GENERATOR_OPENAI_API_KEY in .env file.")
-        elif self.provider == "google" and not GOOGLE_API_KEY:
-            raise ValueError(f"Google API key not configured. Please set TEST_GENERATOR_GOOGLE_API_KEY in .env file. Current value: {GOOGLE_API_KEY}")
-        elif self.provider == "google" and GOOGLE_API_KEY == "your_google_api_key_here":
-            raise ValueError("Google API key is using default value. Please set a valid TEST_GENERATOR_GOOGLE_API_KEY in .env file.")
-        elif self.provider == "anthropic" and not ANTHROPIC_API_KEY:
-            raise ValueError(f"Anthropic API key not configured. Please set TEST_GENERATOR_ANTHROPIC_API_KEY in .env file. Current value: {ANTHROPIC_API_KEY}")
-        elif self.provider == "anthropic" and ANTHROPIC_API_KEY == "your_anthropic_api_key_here":
-            raise ValueError("Anthropic API key is using default value. Please set a valid TEST_GENERATOR_ANTHROPIC_API_KEY in .env file.")
+        _check_api_key(self.provider)
     
     def _initialize_models(self):
         """Initialize Langchain models based on the selected provider"""
         callbacks = [StdOutCallbackHandler()]
         
         if self.provider == "openai":
-            self.chat_model = ChatOpenAI(
-                api_key=OPENAI_API_KEY,
-                base_url=OPENAI_BASE_URL,
-                model=DEFAULT_OPENAI_MODEL,
-                temperature=LLM_TEMPERATURE,
-                callbacks=callbacks,
-                streaming=False,
-                request_timeout=LLM_REQUEST_TIMEOUT
-            )
+            self.chat_model = self._create_openai_model(callbacks)
         elif self.provider == "google":
             try:
                 self.chat_model = ChatGoogleGenerativeAI(
@@ -88,19 +450,13 @@ class LLMProvider:
                     model=DEFAULT_GOOGLE_MODEL,
                     temperature=LLM_TEMPERATURE,
                     callbacks=callbacks,
-                    request_timeout=LLM_REQUEST_TIMEOUT
+                    request_timeout=LLM_REQUEST_TIMEOUT,
+                    max_retries=LLM_MAX_RETRIES
                 )
             except ImportError:
                 logger.warning("langchain_google_genai not installed. Falling back to OpenAI")
                 self.provider = "openai"
-                self.chat_model = ChatOpenAI(
-                    api_key=OPENAI_API_KEY,
-                    base_url=OPENAI_BASE_URL,
-                    model=DEFAULT_OPENAI_MODEL,
-                    temperature=LLM_TEMPERATURE,
-                    callbacks=callbacks,
-                    request_timeout=LLM_REQUEST_TIMEOUT
-                )
+                self.chat_model = self._create_openai_model(callbacks)
         elif self.provider == "anthropic":
             try:
                 self.chat_model = ChatAnthropic(
@@ -108,22 +464,37 @@ class LLMProvider:
                     model=DEFAULT_ANTHROPIC_MODEL,
                     temperature=LLM_TEMPERATURE,
                     callbacks=callbacks,
-                    request_timeout=LLM_REQUEST_TIMEOUT
+                    request_timeout=LLM_REQUEST_TIMEOUT,
+                    max_retries=LLM_MAX_RETRIES
                 )
             except ImportError:
                 logger.warning("langchain_anthropic not installed. Falling back to OpenAI")
                 self.provider = "openai"
-                self.chat_model = ChatOpenAI(
-                    api_key=OPENAI_API_KEY,
-                    base_url=OPENAI_BASE_URL,
-                    model=DEFAULT_OPENAI_MODEL,
-                    temperature=LLM_TEMPERATURE,
-                    callbacks=callbacks,
-                    request_timeout=LLM_REQUEST_TIMEOUT
-                )
+                self.chat_model = self._create_openai_model(callbacks)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
     
+    def _create_openai_model(self, callbacks) -> ChatOpenAI:
+        """Create the OpenAI chat model on top of the shared HTTP client"""
+        return ChatOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            model=DEFAULT_OPENAI_MODEL,
+            temperature=LLM_TEMPERATURE,
+            callbacks=callbacks,
+            streaming=False,
+            request_timeout=LLM_REQUEST_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_async_client=get_http_client()
+        )
+    
+    def _cache_key(self, prompt: str) -> str:
+        """Build the response cache key for a prompt sent to the current model"""
+        model_name = getattr(self.chat_model, "model_name", None) or getattr(self.chat_model, "model", "")
+        # Exact prompt text: whitespace can be meaningful (indented code/YAML, schema strings)
+        payload = orjson.dumps([self.provider, model_name, SYSTEM_PROMPT, prompt, LLM_TEMPERATURE])
+        return hashlib.sha256(payload).hexdigest()
+    
     async def generate_from_prompt(self, prompt: str) -> List[Dict[str, Any]]:
         """
         Generate content directly from a prompt using LLM
@@ -134,96 +505,141 @@ class LLMProvider:
         Returns:
             List of generated items (typically test scenarios)
         """
+        cache_key = self._cache_key(prompt)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached {self.provider} response")
+            return orjson.loads(cached)
+        
+        # Join an identical request that is already running. The call runs as its own
+        # task and every caller shields it, so a cancelled caller doesn't cancel the rest.
+        task = _IN_FLIGHT.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_and_cache(prompt, cache_key))
+            # Mark a failure as retrieved even if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            _IN_FLIGHT[cache_key] = task
+        else:
+            logger.info(f"Awaiting in-flight {self.provider} request for identical prompt")
+        
+        # Each caller decodes its own copy of the shared result
+        return orjson.loads(await asyncio.shield(task))
+    
+    async def _generate_and_cache(self, prompt: str, cache_key: str) -> bytes:
+        """Run one shared LLM call for a prompt and cache its encoded scenarios"""
         try:
-            # Create messages for Langchain
-            messages = [
-                SystemMessage(content="You are a QA engineer specializing in API testing, skilled at creating comprehensive test scenarios. Please respond with valid JSON."),
-                HumanMessage(content=prompt)
-            ]
-            
-            # Set appropriate response format for JSON
-            response_format = None
-            if self.provider == "openai":
-                # For OpenAI, use response_format parameter
-                response_format = {"type": "json_object"}
-            
-            # Invoke the model
-            if response_format:
-                response = await self.chat_model.ainvoke(messages, response_format=response_format)
-            else:
-                response = await self.chat_model.ainvoke(messages)
-            
-            content = response.content
-            
-            # Extract JSON from markdown code blocks if needed
-            content = content.strip()
-            if content.startswith("```json"):
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif content.startswith("```"):
-                content = content.split("```")[1].split("```")[0].strip()
+            scenarios = await self._generate_from_prompt_uncached(prompt)
+            encoded = orjson.dumps(scenarios)
+            _RESPONSE_CACHE[cache_key] = encoded
+            return encoded
+        finally:
+            _IN_FLIGHT.pop(cache_key, None)
+    
+    async def generate_from_prompt_stream(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate content from a prompt, yielding each item as soon as it is complete
+        
+        Args:
+            prompt: The text prompt to send to the LLM
             
-            try:
-                # Parse the JSON content
-                parsed = json.loads(content)
-                # Check if it's directly an array or if it has a wrapper object
-                if isinstance(parsed, list):
-                    return parsed
-                elif "test_scenarios" in parsed:
-                    return parsed["test_scenarios"]
-                elif "scenarios" in parsed:
-                    return parsed["scenarios"]
-                elif "testcases" in parsed:
-                    return parsed["testcases"]
-                else:
-                    # Try to find any list in the object
-                    for key, value in parsed.items():
-                        if isinstance(value, list):
-                            return value
-                    # If no list is found, return empty list
-                    return []
-            except json.JSONDecodeError as e:
-                # Try to extract JSON from the text response
-                import re
-                json_pattern = r'\{[^{}]*\}'
-                matches = re.findall(json_pattern, content)
-                if matches:
-                    # Try each match until we find valid JSON
-                    for match in matches:
-                        try:
-                            parsed = json.loads(match)
-                            if isinstance(parsed, dict):
-                                if "test_scenarios" in parsed:
-                                    return parsed["test_scenarios"]
-                                elif "scenarios" in parsed:
-                                    return parsed["scenarios"]
-                                elif "testcases" in parsed:
-                                    return parsed["testcases"]
-                                else:
-                                    # Try to find any list in the object
-                                    for key, value in parsed.items():
-                                        if isinstance(value, list):
-                                            return value
-                        except json.JSONDecodeError:
+        Yields:
+            Generated items (typically test scenarios) in response order
+        """
+        cache_key = self._cache_key(prompt)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached {self.provider} response")
+            for scenario in orjson.loads(cached):
+                yield scenario
+            return
+        
+        parser = _ScenarioStreamParser()
+        queue: asyncio.Queue = asyncio.Queue()
+        # Read the response in its own task so the LLM slot is held only while reading,
+        # not while the consumer handles each yielded scenario
+        reader = asyncio.ensure_future(self._read_stream(prompt, parser, queue))
+        # Encoded before yielding, so the cache is unaffected by what the consumer does
+        encoded_scenarios = []
+        try:
+            while True:
+                scenario = await queue.get()
+                if scenario is None:
+                    break
+                encoded_scenarios.append(orjson.dumps(scenario))
+                yield scenario
+            # Re-raise a provider error from the reader
+            await reader
+        finally:
+            if not reader.done():
+                reader.cancel()
+        
+        # Not a streamable array (wrapped differently or free text): parse the whole body
+        if not encoded_scenarios:
+            scenarios = _parse_scenarios(parser.text)
+            _RESPONSE_CACHE[cache_key] = orjson.dumps(scenarios)
+            for scenario in scenarios:
+                yield scenario
+            return
+        
+        _RESPONSE_CACHE[cache_key] = b"[" + b",".join(encoded_scenarios) + b"]"
+    
+    async def _read_stream(self, prompt: str, parser: "_ScenarioStreamParser", queue: asyncio.Queue) -> None:
+        """Stream a response through parser, queueing each completed scenario and then None"""
+        try:
+            async with self._request_slot():
+                try:
+                    async for chunk in self.chat_model.astream(self._build_messages(prompt), **self._call_kwargs):
+                        if not isinstance(chunk.content, str):
                             continue
-                
-                # If no valid JSON found, create a structured format from the text
-                return [{
-                    "name": "Generated Scenario",
-                    "description": content,
-                    "steps": []
-                }]
-                
-        except Exception as e:
-            # Provide more detailed error information
-            error_msg = str(e)
-            if "invalid_api_key" in error_msg or "API key" in error_msg:
-                if self.provider == "openai":
-                    raise ValueError(f"OpenAI API key invalid or not set. Please check TEST_GENERATOR_OPENAI_API_KEY in .env file. Error: {error_msg}")
-                elif self.provider == "google":
-                    raise ValueError(f"Google API key invalid or not set. Please check TEST_GENERATOR_GOOGLE_API_KEY in .env file. Error: {error_msg}")
-                elif self.provider == "anthropic":
-                    raise ValueError(f"Anthropic API key invalid or not set. Please check TEST_GENERATOR_ANTHROPIC_API_KEY in .env file. Error: {error_msg}")
-            raise ValueError(f"Error generating content with {self.provider}: {error_msg}")
+                        for scenario in parser.feed(chunk.content):
+                            queue.put_nowait(scenario)
+                except Exception as e:
+                    raise self._provider_error(e)
+        finally:
+            queue.put_nowait(None)
+    
+    def _build_messages(self, prompt: str) -> List[Any]:
+        """Create the Langchain messages for a prompt"""
+        return [_SYSTEM_MESSAGE, HumanMessage(content=prompt)]
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the process-wide LLM request slots, paced by the provider's rate limit"""
+        async with _get_llm_semaphore():
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            yield
+    
+    def _invoke_kwargs(self) -> Dict[str, Any]:
+        """Provider-specific model call options"""
+        # For OpenAI, use response_format parameter to force a JSON response
+        if self.provider == "openai":
+            return {"response_format": {"type": "json_object"}}
+        return {}
+    
+    def _provider_error(self, e: Exception) -> ValueError:
+        """Translate a model call failure into a descriptive ValueError"""
+        # Provide more detailed error information
+        error_msg = str(e)
+        auth_failed = (
+            getattr(e, "status_code", None) in _AUTH_ERROR_STATUSES
+            or "invalid_api_key" in error_msg
+            or "API key" in error_msg
+        )
+        if auth_failed and self.provider in _PROVIDER_KEYS:
+            name, _, env_var = _PROVIDER_KEYS[self.provider]
+            return ValueError(f"{name} API key invalid or not set. Please check {env_var} in .env file. Error: {error_msg}")
+        return ValueError(f"Error generating content with {self.provider}: {error_msg}")
+    
+    async def _generate_from_prompt_uncached(self, prompt: str) -> List[Dict[str, Any]]:
+        """Call the LLM for a prompt and parse the scenarios from its response"""
+        async with self._request_slot():
+            try:
+                response = await self.chat_model.ainvoke(self._build_messages(prompt), **self._call_kwargs)
+            except Exception as e:
+                raise self._provider_error(e)
+        
+        return _parse_scenarios(response.content)
     
     async def generate_test_scenarios(self, 
                                      api_spec: Dict[str, Any],
@@ -240,18 +656,197 @@ class LLMProvider:
         Returns:
             List of test scenarios
         """
-        prompt = self._get_prompt(api_spec, api_path, method)
+        prompt = await self._get_cached_prompt(api_spec, api_path, method)
         return await self.generate_from_prompt(prompt)
     
+    async def generate_test_scenarios_stream(self,
+                                            api_spec: Dict[str, Any],
+                                            api_path: str,
+                                            method: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate test scenarios from API specification, yielding each one as it is generated
+        
+        Args:
+            api_spec: The OpenAPI specification
+            api_path: The API path to generate scenarios for
+            method: The HTTP method to generate scenarios for
+            
+        Yields:
+            Test scenarios in response order
+        """
+        prompt = await self._get_cached_prompt(api_spec, api_path, method)
+        async for scenario in self.generate_from_prompt_stream(prompt):
+            yield scenario
+    
+    async def generate_test_scenarios_many(self,
+                                          api_spec: Dict[str, Any],
+                                          endpoints: List[Tuple[str, str]],
+                                          concurrency: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Generate test scenarios for several endpoints with one concurrent LLM call each
+        
+        Args:
+            api_spec: The OpenAPI specification
+            endpoints: (api_path, method) pairs to generate scenarios for
+            concurrency: Maximum calls in flight (default: TEST_GENERATOR_LLM_CONCURRENCY)
+            
+        Returns:
+            Test scenarios per endpoint, in the order of endpoints
+        """
+        semaphore = asyncio.Semaphore(concurrency or LLM_CONCURRENCY)
+        
+        async def generate_one(api_path: str, method: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.generate_test_scenarios(api_spec, api_path, method)
+        
+        return await asyncio.gather(*[generate_one(api_path, method) for api_path, method in endpoints])
+    
+    async def generate_test_scenarios_batch(self,
+                                           api_spec: Dict[str, Any],
+                                           endpoints: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Generate test scenarios for several endpoints with as few LLM calls as possible
+        
+        Endpoints are grouped into prompts of at most BATCH_MAX_PROMPT_CHARS characters
+        and each group is sent as one request. Endpoints missing from a batched answer
+        are retried individually.
+        
+        Args:
+            api_spec: The OpenAPI specification
+            endpoints: (api_path, method) pairs to generate scenarios for
+            
+        Returns:
+            Dict mapping "METHOD path" to that endpoint's test scenarios
+        """
+        descriptions = {
+            (api_path, method): self._describe_endpoint(api_spec, api_path, method)
+            for api_path, method in endpoints
+        }
+        
+        # Group endpoints so each combined prompt stays within the budget
+        groups: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        size = 0
+        for endpoint, description in descriptions.items():
+            if current and size + len(description) > BATCH_MAX_PROMPT_CHARS:
+                groups.append(current)
+                current, size = [], 0
+            current.append(endpoint)
+            size += len(description)
+        if current:
+            groups.append(current)
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        group_results = await asyncio.gather(
+            *[self._generate_batch_group(api_spec, group, descriptions) for group in groups]
+        )
+        for group_result in group_results:
+            results.update(group_result)
+        return results
+    
+    async def _generate_batch_group(self,
+                                    api_spec: Dict[str, Any],
+                                    group: List[Tuple[str, str]],
+                                    descriptions: Dict[Tuple[str, str], str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate scenarios for one group of endpoints with a single LLM call"""
+        if len(group) == 1:
+            api_path, method = group[0]
+            return {_endpoint_key(api_path, method): await self.generate_test_scenarios(api_spec, api_path, method)}
+        
+        prompt = self._get_batch_prompt(api_spec, group, descriptions)
+        async with self._request_slot():
+            try:
+                response = await self.chat_model.ainvoke(self._build_messages(prompt), **self._call_kwargs)
+            except Exception as e:
+                raise self._provider_error(e)
+        
+        try:
+            parsed = orjson.loads(_strip_fence(response.content))
+        except orjson.JSONDecodeError:
+            parsed = {}
+        if not isinstance(parsed, dict):
+            parsed = {}
+        
+        # Demultiplex the answer by endpoint key
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        missing: List[Tuple[str, str]] = []
+        for api_path, method in group:
+            scenarios = _extract_scenario_list(parsed.get(_endpoint_key(api_path, method)))
+            if scenarios is None:
+                missing.append((api_path, method))
+            else:
+                results[_endpoint_key(api_path, method)] = scenarios
+        
+        if missing:
+            logger.warning(f"Batched response missed {len(missing)} of {len(group)} endpoints, generating them individually")
+            retried = await asyncio.gather(
+                *[self.generate_test_scenarios(api_spec, api_path, method) for api_path, method in missing]
+            )
+            for (api_path, method), scenarios in zip(missing, retried):
+                results[_endpoint_key(api_path, method)] = scenarios
+        
+        return results
+    
+    async def _get_cached_prompt(self, api_spec: Dict[str, Any], api_path: str, method: str) -> str:
+        """
+        Return the prompt for an endpoint, building it only once per spec object
+        
+        Specs are treated as immutable once passed in; mutate a copy instead.
+        """
+        key = (id(api_spec), api_path, method)
+        entry = _PROMPT_CACHE.get(key)
+        if entry is not None:
+            _PROMPT_CACHE.move_to_end(key)
+            return entry[1]
+        
+        # Dumping large schemas is CPU-bound; keep it off the event loop so
+        # concurrent LLM requests aren't stalled
+        prompt = await asyncio.to_thread(self._get_prompt, api_spec, api_path, method)
+        _PROMPT_CACHE[key] = (api_spec, prompt)
+        if len(_PROMPT_CACHE) > PROMPT_CACHE_MAXSIZE:
+            _PROMPT_CACHE.popitem(last=False)
+        return prompt
+    
     def _get_prompt(self, api_spec: Dict[str, Any], api_path: str, method: str) -> str:
         """Generate a prompt for scenario generation based on API spec"""
+        return (
+            f"Based on the following API specification, generate comprehensive test scenarios for {method.upper()} {api_path} interface:\n\n"
+            + self._describe_api(api_spec)
+            + self._describe_endpoint(api_spec, api_path, method)
+            + _SCENARIO_INSTRUCTIONS
+        )
+    
+    def _get_batch_prompt(self,
+                          api_spec: Dict[str, Any],
+                          endpoints: List[Tuple[str, str]],
+                          descriptions: Dict[Tuple[str, str], str]) -> str:
+        """Generate one prompt covering several endpoints of the same API spec"""
+        sections = [
+            f"Based on the following API specification, generate comprehensive test scenarios for each of the {len(endpoints)} interfaces below:\n\n",
+            self._describe_api(api_spec),
+        ]
+        for api_path, method in endpoints:
+            sections.append(f"\n## {_endpoint_key(api_path, method)}\n")
+            sections.append(descriptions[(api_path, method)])
+        sections.append(_BATCH_SCENARIO_INSTRUCTIONS)
+        return "".join(sections)
+    
+    def _describe_api(self, api_spec: Dict[str, Any]) -> str:
+        """Describe the API as a whole for a prompt"""
+        api_title = api_spec.get("info", {}).get("title", "Unknown API")
+        api_description = api_spec.get("info", {}).get("description", "No description")
+        return f"""API Information:
+- Title: {api_title}
+- Description: {api_description}
+"""
+    
+    def _describe_endpoint(self, api_spec: Dict[str, Any], api_path: str, method: str) -> str:
+        """Describe a single operation (parameters, request body, responses) for a prompt"""
         # Get path details
         path_spec = api_spec.get("paths", {}).get(api_path, {})
         method_spec = path_spec.get(method.lower(), {})
         
-        # Get API information
-        api_title = api_spec.get("info", {}).get("title", "Unknown API")
-        api_description = api_spec.get("info", {}).get("description", "No description")
+        # Get operation information
         operation_id = method_spec.get("operationId", f"{method} {api_path}")
         operation_summary = method_spec.get("summary", "No summary")
         operation_description = method_spec.get("description", "No detailed description")
@@ -271,13 +866,7 @@ class LLMProvider:
         # Get response details
         responses = method_spec.get("responses", {})
         
-        # Create the prompt
-        prompt = f"""Based on the following API specification, generate comprehensive test scenarios for {method.upper()} {api_path} interface:
-
-API Information:
-- Title: {api_title}
-- Description: {api_description}
-
+        description = f"""
 Operation Information:
 - Operation ID: {operation_id}
 - Summary: {operation_summary}
@@ -286,7 +875,7 @@ Operation Information:
 
         # Add parameters information
         if parameters:
-            prompt += "\nParameter Information:"
+            description += "\nParameter Information:"
             for param in parameters:
                 param_name = param.get("name", "Unknown parameter")
                 param_in = param.get("in", "Unknown location")  # path, query, header, cookie
@@ -295,7 +884,7 @@ Operation Information:
                 param_format = param.get("schema", {}).get("format", "None")
                 param_description = param.get("description", "No description")
                 
-                prompt += f"""
+                description += f"""
 - {param_name} ({param_in})
   - Required: {param_required}
   - Type: {param_type}
@@ -304,58 +893,33 @@ Operation Information:
         
         # Add request body information
         if request_schema:
-            prompt += "\n\nRequest Body:"
-            prompt += f"\n```json\n{json.dumps(request_schema, ensure_ascii=False, indent=2)}\n```"
+            description += "\n\nRequest Body:"
+            description += f"\n```json\n{_dump_schema(request_schema)}\n```"
         
         # Add response information
         if responses:
-            prompt += "\n\nResponse Information:"
+            description += "\n\nResponse Information:"
             for status_code, response_details in responses.items():
                 response_description = response_details.get("description", "No description")
-                prompt += f"\n- {status_code}: {response_description}"
+                description += f"\n- {status_code}: {response_description}"
                 
                 # Add response schema if available
                 response_content = response_details.get("content", {})
                 for content_type, content_details in response_content.items():
                     if "schema" in content_details:
                         response_schema = content_details["schema"]
-                        prompt += f"\n  Content Type: {content_type}"
-                        prompt += f"\n  Schema:\n```json\n{json.dumps(response_schema, ensure_ascii=False, indent=2)}\n```"
+                        description += f"\n  Content Type: {content_type}"
+                        description += f"\n  Schema:\n```json\n{_dump_schema(response_schema)}\n```"
         
-        prompt += """
-
-Please create comprehensive test scenarios for this API, including positive tests, negative tests, boundary tests, etc.
-For each scenario, provide the following information:
-1. Scenario name
-2. Scenario description
-3. Preconditions
-4. Test steps
-5. Expected results
-6. Request parameters/examples (JSON format)
-7. Test priority (P0-P3)
-8. Applicable environments
+        return description
+    
+def _dump_schema(schema: Any) -> str:
+    """Pretty-print a JSON schema for inclusion in a prompt"""
+    return orjson.dumps(schema, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
-Based on the API specification above, please return 5-10 test scenarios in the following JSON format:
+# Provider instances by name; models and their HTTP clients are reused across tool calls
+_PROVIDER_CACHE: Dict[str, "LLMProvider"] = {}
 
-```json
-[
-  {
-    "name": "Scenario name",
-    "description": "Scenario description",
-    "preconditions": "Preconditions",
-    "steps": ["Step 1", "Step 2", "..."],
-    "expected_result": "Expected result",
-    "request_example": {},
-    "priority": "P0-P3",
-    "environment": ["Development", "Testing", "Production"]
-  }
-]
-```
-
-Please ensure the scenarios are comprehensive and focus on potential security issues, performance considerations, and boundary conditions.
-"""
-        return prompt
-    
 def get_llm_provider(provider: Optional[str] = None) -> LLMProvider:
     """
     Factory function to get an LLM provider instance
@@ -364,6 +928,21 @@ def get_llm_provider(provider: Optional[str] = None) -> LLMProvider:
         provider: The LLM provider to use. If None, uses the DEFAULT_LLM_PROVIDER from env vars
         
     Returns:
-        An instance of LLMProvider
+        An instance of LLMProvider, shared by all callers asking for the same provider
+    """
+    name = provider.lower() if provider else DEFAULT_LLM_PROVIDER
+    _check_event_loop()
+    instance = _PROVIDER_CACHE.get(name)
+    if instance is None:
+        instance = LLMProvider(name)
+        _PROVIDER_CACHE[name] = instance
+    return instance 
+
+def reset_llm_providers():
+    """
+    Drop the shared provider instances so the next call builds fresh ones
+    
+    API keys, models and base URLs are read once at import, so new instances use
+    the same configuration; changing it requires restarting the server.
     """
-    return LLMProvider(provider) 
\ No newline at end of file
+    _PROVIDER_CACHE.clear()
\ No newline at end of file
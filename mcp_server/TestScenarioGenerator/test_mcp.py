@@ -13,12 +13,20 @@ if project_root not in sys.path:
 env_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(env_path)
 
+# Scenario generation calls the default LLM provider for real; skip without its API key
+LLM_API_KEY_VAR = f"TEST_GENERATOR_{os.getenv('TEST_GENERATOR_DEFAULT_LLM_PROVIDER', 'openai').upper()}_API_KEY"
+requires_llm_api_key = pytest.mark.skipif(
+    not os.getenv(LLM_API_KEY_VAR),
+    reason=f"{LLM_API_KEY_VAR} not set"
+)
+
 from test_scenario_generator import (
     generate_test_scenarios,
     generate_test_scenarios_from_description,
     get_metersphere_test_case_json
 )
 
+@requires_llm_api_key
 @pytest.mark.asyncio
 async def test_generate_test_scenarios():
     """Test generating test scenarios from a query"""
@@ -30,6 +38,7 @@ async def test_generate_test_scenarios():
     assert "test_scenarios" in scenarios
     assert len(scenarios["test_scenarios"]) > 0
 
+@requires_llm_api_key
 @pytest.mark.asyncio
 async def test_generate_test_scenarios_from_description():
     """Test generating test scenarios from API description"""
@@ -1,15 +1,22 @@
 import json
 import os
+import re
 import sys
+import asyncio
 import glob
+import textwrap
+import threading
 import requests
-from typing import Dict, List, Any, Optional
+import orjson
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from langchain.tools import tool
 from langchain_core.messages import HumanMessage
-from mcp.server.fastmcp import FastMCP
-from llm_provider import get_llm_provider
+from mcp.server.fastmcp import FastMCP, Context
+from llm_provider import get_llm_provider, close_http_client, clear_response_cache, reset_llm_providers
 
 # Load environment variables from the current directory
 env_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -34,13 +41,84 @@ UPLOADS_DIR = os.path.join(backend_dir, os.getenv('UPLOAD_DIR', 'uploads/documen
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 API_TOKEN = os.getenv("API_TOKEN", "")
 
+# Default Metersphere target for converted test cases
+METERSPHERE_APP_ID = os.getenv("METERSPHERE_APP_ID", "default")
+METERSPHERE_INTERFACE_ID = os.getenv("METERSPHERE_INTERFACE_ID", "default")
+
+# Prompt templates for the LLM-backed tools, dedented once at import and filled in
+# with str.format_map
+_QUERY_PROMPT = textwrap.dedent("""\
+    Generate comprehensive test scenarios for the following functionality:
+    {query}
+    
+    For each test scenario, provide:
+    1. A descriptive name
+    2. A detailed description of the test case
+    3. Test steps with expected results
+    
+    Format the output as a JSON object with a "test_scenarios" key containing an array of scenario objects.
+    """)
+
+_DESCRIPTION_PROMPT = textwrap.dedent("""\
+    Generate comprehensive test scenarios for the API endpoint: {api_path}
+    
+    API Description:
+    {api_description}
+    
+    For each test scenario, provide:
+    1. A descriptive name
+    2. A detailed description of the test case
+    3. The request data (including headers, path parameters, query parameters, and body as applicable)
+    4. The expected response (status code and body)
+    
+    Only include scenarios for:
+    - {category}
+    
+    Format the output as a JSON object with a "scenarios" key containing an array of scenario objects.
+    """)
+
+# Scenario categories generate_test_scenarios_from_description requests concurrently,
+# one LLM call each
+SCENARIO_CATEGORIES = [
+    "Normal operation with valid input",
+    "Edge cases (empty arrays, null values, etc.)",
+    "Error cases (invalid input, missing required fields, etc.)",
+    "Authorization/authentication issues (if applicable)",
+]
+
+# Parsed API specification files keyed by (path, mtime, size), so a changed file is re-read
+API_SPEC_CACHE_MAXSIZE = int(os.getenv("TEST_GENERATOR_API_SPEC_CACHE_MAXSIZE", "16"))
+_API_SPEC_CACHE: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+# Specs are loaded in worker threads
+_API_SPEC_CACHE_LOCK = threading.Lock()
+
+# Operation keys of an OpenAPI path item
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+def _dumps_indented(obj: Any, prefix: str) -> str:
+    """Serialize to indented JSON whose continuation lines start with prefix"""
+    text = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return text.replace("\n", "\n" + prefix)
+
+@asynccontextmanager
+async def server_lifespan(server):
+    """Release the shared LLM HTTP client when the MCP server stops"""
+    try:
+        yield
+    finally:
+        await close_http_client()
+
 # Create MCP instance
-mcp = FastMCP("TestScenarioGenerator")
+mcp = FastMCP("TestScenarioGenerator", lifespan=server_lifespan)
 
-def get_llm_provider_instance():
+def get_llm_provider_instance(provider_name: Optional[str] = None):
     """Get the LLM provider instance"""
     try:
-        provider = get_llm_provider()
+        provider = get_llm_provider(provider_name)
         logger.info(f"Using LLM provider: {provider.provider}")
         return provider
     except Exception as e:
@@ -52,34 +130,21 @@ def get_api_token():
     Get the API token for requests.
     
     Attempts to get the token from various possible sources:
-    - API_TOKEN environment variable
-    - .env file
+    - API_TOKEN environment variable or .env file (read at import)
     - Session file
     
     Returns:
         str: API token or empty string
     """
-    # First check environment variable
-    token = os.getenv("API_TOKEN", "")
-    if token:
-        return token
-    
-    # Try loading from .env file
-    try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        token = os.getenv("API_TOKEN", "")
-        if token:
-            return token
-    except ImportError:
-        pass
+    if API_TOKEN:
+        return API_TOKEN
     
     # Try finding session file
     try:
         session_file = os.path.join(os.path.expanduser("~"), ".ia_session")
         if os.path.exists(session_file):
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
+            with open(session_file, 'rb') as f:
+                session_data = orjson.loads(f.read())
                 return session_data.get("token", "")
     except Exception as e:
         logger.warning(f"Failed to read session file: {str(e)}")
@@ -246,17 +311,7 @@ async def generate_test_scenarios(query: str) -> str:
     """
     try:
         # Prepare prompt for the LLM
-        prompt = f"""
-        Generate comprehensive test scenarios for the following functionality:
-        {query}
-        
-        For each test scenario, provide:
-        1. A descriptive name
-        2. A detailed description of the test case
-        3. Test steps with expected results
-        
-        Format the output as a JSON object with a "test_scenarios" key containing an array of scenario objects.
-        """
+        prompt = _QUERY_PROMPT.format_map({"query": query})
         
         # Get LLM provider instance
         llm_provider = get_llm_provider_instance()
@@ -266,10 +321,74 @@ async def generate_test_scenarios(query: str) -> str:
         
         # Format the response
         result = {"test_scenarios": scenarios}
-        return json.dumps(result)
+        return _dumps(result)
     except Exception as e:
         logger.error(f"Error generating test scenarios: {str(e)}")
-        return json.dumps({"error": str(e)})
+        return _dumps({"error": str(e)})
+
+@mcp.tool()
+async def generate_test_scenarios_stream(query: str, ctx: Context) -> str:
+    """
+    Generate test scenarios for the provided query, reporting each one as soon as it is generated.
+    
+    Every completed scenario is sent to the client as a log message (JSON) together
+    with a progress notification, so results can be shown before generation ends.
+    
+    Args:
+        query: A description of the functionality to generate test scenarios for
+        
+    Returns:
+        JSON string containing all generated test scenarios
+    """
+    try:
+        prompt = _QUERY_PROMPT.format_map({"query": query})
+        llm_provider = get_llm_provider_instance()
+        
+        scenarios = []
+        async for scenario in llm_provider.generate_from_prompt_stream(prompt):
+            scenarios.append(scenario)
+            await ctx.info(_dumps(scenario))
+            await ctx.report_progress(len(scenarios))
+        
+        return _dumps({"test_scenarios": scenarios})
+    except Exception as e:
+        logger.error(f"Error streaming test scenarios: {str(e)}")
+        return _dumps({"error": str(e)})
+
+@mcp.tool()
+def clear_scenario_cache() -> Dict:
+    """
+    Clear cached LLM-generated test scenarios so the next request regenerates them.
+    
+    Returns:
+        Dictionary with the number of cached responses removed
+    """
+    cleared = clear_response_cache()
+    logger.info(f"Cleared {cleared} cached LLM responses")
+    return {"cleared": cleared}
+
+@mcp.tool()
+def reset_llm_provider_instances() -> Dict:
+    """
+    Drop the cached LLM provider instances so they are recreated on next use.
+    
+    Provider settings (API keys, models, base URLs) are read when the server
+    starts, so this does not pick up configuration changes; restart for that.
+    
+    Returns:
+        Dictionary confirming the reset
+    """
+    reset_llm_providers()
+    logger.info("LLM provider instances reset")
+    return {"reset": True}
+
+def _get_description_prompt(api_description: str, api_path: str, category: str) -> str:
+    """Build the prompt for one category of scenarios for a described API endpoint"""
+    return _DESCRIPTION_PROMPT.format_map({
+        "api_path": api_path,
+        "api_description": api_description,
+        "category": category
+    })
 
 @mcp.tool()
 async def generate_test_scenarios_from_description(api_description: str, api_path: str, 
@@ -292,38 +411,37 @@ async def generate_test_scenarios_from_description(api_description: str, api_pat
     logger.info(f"Generating test scenarios from description for {api_path}")
     
     try:
-        # Prepare prompt for the LLM
-        prompt = f"""
-        Generate comprehensive test scenarios for the API endpoint: {api_path}
-        
-        API Description:
-        {api_description}
-        
-        For each test scenario, provide:
-        1. A descriptive name
-        2. A detailed description of the test case
-        3. The request data (including headers, path parameters, query parameters, and body as applicable)
-        4. The expected response (status code and body)
-        
-        Include scenarios for:
-        - Normal operation with valid input
-        - Edge cases (empty arrays, null values, etc.)
-        - Error cases (invalid input, missing required fields, etc.)
-        - Authorization/authentication issues (if applicable)
-        
-        Format the output as a JSON object with a "scenarios" key containing an array of scenario objects.
-        """
-        
         # Get LLM provider instance
-        llm_provider_instance = get_llm_provider_instance()
+        llm_provider_instance = get_llm_provider_instance(llm_provider)
         
-        # Generate scenarios using LLM
-        scenarios = await llm_provider_instance.generate_from_prompt(prompt)
+        # Generate each category with its own prompt so the calls run in parallel
+        prompts = [
+            _get_description_prompt(api_description, api_path, category)
+            for category in SCENARIO_CATEGORIES
+        ]
+        results = await asyncio.gather(
+            *(llm_provider_instance.generate_from_prompt(prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+        
+        scenarios = []
+        errors = []
+        failed_categories = []
+        for category, category_result in zip(SCENARIO_CATEGORIES, results):
+            if isinstance(category_result, BaseException):
+                logger.warning(f"Failed to generate '{category}' scenarios for {api_path}: {str(category_result)}")
+                errors.append(category_result)
+                failed_categories.append(category)
+            else:
+                scenarios.extend(category_result)
+        if errors and not scenarios:
+            raise errors[0]
         
-        # Add metadata
+        # Add metadata (failed_categories tells callers the result is partial)
         result = {
             "api_path": api_path,
-            "scenarios": scenarios
+            "scenarios": scenarios,
+            "failed_categories": failed_categories
         }
         
         if application_id:
@@ -337,6 +455,101 @@ async def generate_test_scenarios_from_description(api_description: str, api_pat
         logger.error(error_msg)
         return {"error": error_msg}
 
+def _index_api_spec(api_json: Any) -> Dict[str, Any]:
+    """
+    Return an OpenAPI-shaped spec whose "paths" maps each path to its operations
+    
+    Files holding a plain list of endpoints ({"path": ..., "method": ...}) are indexed
+    by path once here, so lookups don't scan the list on every request.
+    """
+    if not isinstance(api_json, list):
+        return api_json
+    
+    paths: Dict[str, Dict[str, Any]] = {}
+    for endpoint in api_json:
+        if isinstance(endpoint, dict) and "path" in endpoint:
+            method = str(endpoint.get("method", "get")).lower()
+            paths.setdefault(endpoint["path"], {})[method] = endpoint
+    return {"paths": paths}
+
+def _load_api_spec(api_json_path: str) -> Dict[str, Any]:
+    """
+    Read an OpenAPI specification from a JSON file, parsing each file version only once
+    
+    The same dict is returned while the file is unchanged, which also lets the LLM
+    provider reuse the prompts it built from it. Treat it as read-only.
+    """
+    st = os.stat(api_json_path)
+    key = (os.path.abspath(api_json_path), st.st_mtime_ns, st.st_size)
+    with _API_SPEC_CACHE_LOCK:
+        api_spec = _API_SPEC_CACHE.get(key)
+        if api_spec is not None:
+            _API_SPEC_CACHE.move_to_end(key)
+            return api_spec
+    
+    with open(api_json_path, 'rb') as f:
+        api_spec = _index_api_spec(orjson.loads(f.read()))
+    with _API_SPEC_CACHE_LOCK:
+        _API_SPEC_CACHE[key] = api_spec
+        if len(_API_SPEC_CACHE) > API_SPEC_CACHE_MAXSIZE:
+            _API_SPEC_CACHE.popitem(last=False)
+    return api_spec
+
+@mcp.tool()
+async def generate_test_scenarios_batch(api_json_path: str, api_paths: List[str],
+                                        llm_provider: Optional[str] = None) -> Dict:
+    """
+    Generate test scenarios for several API paths of an OpenAPI specification at once.
+    
+    Endpoints are combined into as few LLM calls as the prompt size allows, which
+    keeps bulk generation under provider request-rate limits.
+    
+    Args:
+        api_json_path: Path or uploaded filename of the OpenAPI JSON file
+        api_paths: API paths to generate test scenarios for (all operations of each path)
+        llm_provider: Optional LLM provider to use (default: uses DEFAULT_LLM_PROVIDER from env)
+        
+    Returns:
+        Dictionary mapping "METHOD path" to its test scenarios
+    """
+    logger.info(f"Generating batched test scenarios for {len(api_paths)} paths from {api_json_path}")
+    
+    # File lookup (API call, directory scans) and parsing block, so run them in threads
+    file_path = await asyncio.to_thread(find_uploaded_file, api_json_path)
+    if not file_path:
+        return {"error": f"API specification file not found: {api_json_path}"}
+    
+    try:
+        api_spec = await asyncio.to_thread(_load_api_spec, file_path)
+        paths = api_spec.get("paths", {})
+        
+        endpoints = []
+        missing_paths = []
+        for api_path in api_paths:
+            path_item = paths.get(api_path)
+            if not path_item:
+                missing_paths.append(api_path)
+                continue
+            endpoints.extend((api_path, method) for method in path_item if method.lower() in HTTP_METHODS)
+        
+        scenarios = {}
+        if endpoints:
+            llm_provider_instance = get_llm_provider_instance(llm_provider)
+            scenarios = await llm_provider_instance.generate_test_scenarios_batch(api_spec, endpoints)
+        
+        result = {"scenarios": scenarios}
+        if missing_paths:
+            result["missing_paths"] = missing_paths
+        return result
+    except Exception as e:
+        error_msg = f"Error generating batched test scenarios: {str(e)}"
+        logger.error(error_msg)
+        return {"error": error_msg}
+
+# Fixed fields of every Metersphere test case (method defaults to POST)
+_MS_CASE_DEFAULTS = {"priority": "P0", "type": "API", "method": "POST"}
+_MS_CASE_TAGS = ("auto-generated", "API-test")
+
 @mcp.tool()
 def get_metersphere_test_case_json(scenario: Dict[str, Any], application_id: Optional[str] = None,
                                  interface_id: Optional[str] = None) -> Dict:
@@ -355,19 +568,18 @@ def get_metersphere_test_case_json(scenario: Dict[str, Any], application_id: Opt
     
     try:
         # Default values
-        app_id = application_id or os.getenv("METERSPHERE_APP_ID", "default")
-        interface_id = interface_id or os.getenv("METERSPHERE_INTERFACE_ID", "default")
+        app_id = application_id or METERSPHERE_APP_ID
+        interface_id = interface_id or METERSPHERE_INTERFACE_ID
+        expected_response = scenario.get("expected_response") or {}
         
         # Convert to Metersphere format
         ms_case = {
             "name": scenario.get("name", "Generated Test Case"),
-            "priority": "P0",
-            "type": "API",
-            "method": "POST",  # Default method
+            **_MS_CASE_DEFAULTS,
             "path": scenario.get("api_path", ""),
             "applicationId": app_id,
             "moduleId": interface_id,
-            "tags": ["auto-generated", "API-test"],
+            "tags": list(_MS_CASE_TAGS),
             "description": scenario.get("description", ""),
             "steps": [
                 {
@@ -381,11 +593,11 @@ def get_metersphere_test_case_json(scenario: Dict[str, Any], application_id: Opt
                     "assertions": [
                         {
                             "type": "STATUS_CODE",
-                            "value": str(scenario.get("expected_response", {}).get("status", 200))
+                            "value": str(expected_response.get("status", 200))
                         },
                         {
                             "type": "RESPONSE_BODY",
-                            "value": json.dumps(scenario.get("expected_response", {}).get("body", {}))
+                            "value": _dumps(expected_response.get("body", {}))
                         }
                     ]
                 }
@@ -398,27 +610,11 @@ def get_metersphere_test_case_json(scenario: Dict[str, Any], application_id: Opt
         logger.error(error_msg)
         return {"error": error_msg}
 
-@mcp.tool()
-def generate_test_script(scenarios: Dict[str, List[Dict[str, Any]]], api_path: str, 
-                       output_file: Optional[str] = None) -> str:
-    """
-    Generate a Python test script from test scenarios.
-    
-    Args:
-        scenarios: Dictionary containing test scenarios 
-        api_path: API path the scenarios are for
-        output_file: Optional file to save the generated script to
-        
-    Returns:
-        Generated test script as string
-    """
-    logger.info(f"Generating test script for {api_path}")
-    
-    try:
-        api_scenarios = scenarios.get("scenarios", [])
-        
-        # Generate script header
-        script = """
+# Characters not allowed in a test method name (\W is exactly "not str.isalnum() and not _")
+_NON_WORD_RE = re.compile(r"\W")
+
+# Fixed start and end of scripts produced by generate_test_script
+_TEST_SCRIPT_HEADER = """
 import unittest
 import requests
 import json
@@ -442,58 +638,87 @@ class APITestCase(unittest.TestCase):
         }
     
 """
+
+_TEST_SCRIPT_FOOTER = """
+if __name__ == "__main__":
+    unittest.main()
+"""
+
+def _write_text_file(path: str, content: str):
+    """Write text to a file as UTF-8"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+@mcp.tool()
+async def generate_test_script(scenarios: Dict[str, List[Dict[str, Any]]], api_path: str, 
+                       output_file: Optional[str] = None) -> str:
+    """
+    Generate a Python test script from test scenarios.
+    
+    Args:
+        scenarios: Dictionary containing test scenarios 
+        api_path: API path the scenarios are for
+        output_file: Optional file to save the generated script to
+        
+    Returns:
+        Generated test script as string
+    """
+    logger.info(f"Generating test script for {api_path}")
+    
+    try:
+        api_scenarios = scenarios.get("scenarios", [])
+        
+        # Collect the script in pieces and join once at the end
+        parts = [_TEST_SCRIPT_HEADER]
         
         # Generate test method for each scenario
         for i, scenario in enumerate(api_scenarios):
             # Clean name for use as method name
             method_name = scenario.get("name", f"test_scenario_{i+1}")
-            method_name = "test_" + "".join(c if c.isalnum() else "_" for c in method_name.lower())
+            method_name = "test_" + _NON_WORD_RE.sub("_", method_name.lower())
             
             # Add method comments
-            script += f"    def {method_name}(self):\n"
-            script += f'        """{scenario.get("description", "Test scenario")}"""\n'
+            parts.append(f"    def {method_name}(self):\n")
+            parts.append(f'        """{scenario.get("description", "Test scenario")}"""\n')
             
             # Request body
             request_data = scenario.get("request", {})
-            script += f"        # Prepare request data\n"
-            script += f"        request_data = {json.dumps(request_data, indent=8)}\n\n"
+            parts.append("        # Prepare request data\n")
+            parts.append(f"        request_data = {_dumps_indented(request_data, '        ')}\n\n")
             
             # API call
-            script += f"        # Call API\n"
-            script += f'        response = requests.post(f"{{API_BASE_URL}}{api_path}", headers=self.headers, json=request_data)\n\n'
+            parts.append("        # Call API\n")
+            parts.append(f'        response = requests.post(f"{{API_BASE_URL}}{api_path}", headers=self.headers, json=request_data)\n\n')
             
             # Assertions
             expected_response = scenario.get("expected_response", {})
             expected_status = expected_response.get("status", 200)
             
-            script += f"        # Assertions\n"
-            script += f"        self.assertEqual({expected_status}, response.status_code)\n"
+            parts.append("        # Assertions\n")
+            parts.append(f"        self.assertEqual({expected_status}, response.status_code)\n")
             
             if "body" in expected_response:
-                script += f"        response_data = response.json()\n"
+                parts.append("        response_data = response.json()\n")
                 expected_body = expected_response.get("body", {})
                 
                 if isinstance(expected_body, dict):
                     for key, value in expected_body.items():
-                        script += f"        self.assertIn('{key}', response_data)\n"
+                        parts.append(f"        self.assertIn('{key}', response_data)\n")
                         if isinstance(value, (int, float, bool)):
-                            script += f"        self.assertEqual({value}, response_data['{key}'])\n"
+                            parts.append(f"        self.assertEqual({value}, response_data['{key}'])\n")
                         else:
-                            script += f"        self.assertEqual('{value}', response_data['{key}'])\n"
+                            parts.append(f"        self.assertEqual('{value}', response_data['{key}'])\n")
             
-            script += "\n"
+            parts.append("\n")
         
         # Add main section
-        script += """
-if __name__ == "__main__":
-    unittest.main()
-"""
+        parts.append(_TEST_SCRIPT_FOOTER)
+        script = "".join(parts)
         
         # Save to file if specified
         if output_file:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(script)
+                await asyncio.to_thread(_write_text_file, output_file, script)
                 logger.info(f"Test script saved to {output_file}")
             except Exception as e:
                 logger.error(f"Failed to write test script to file: {str(e)}")
@@ -3,16 +3,19 @@
 Math expression calculation tool server
 Processes mathematical expressions and returns the calculated results
 """
+import os
 import re
-import math
+import ast
+import operator
 import logging
 import traceback
+from functools import lru_cache
 from typing import Optional
 from mcp.server.fastmcp import FastMCP
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
         logging.StreamHandler()
@@ -23,6 +26,70 @@ logger = logging.getLogger("math-tool")
 # 创建FastMCP实例
 mcp = FastMCP("Math")
 
+# Patterns locating an expression in a query, tried in order
+EXPRESSION_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'calculate\s*([\d\s\+\-\*\/\^\(\)]+)',
+    r'([\d\s\+\-\*\/\^\(\)]+)equals',
+    r'([\d\s\+\-\*\/\^\(\)]+)is',
+    r'compute\s*([\d\s\+\-\*\/\^\(\)]+)',
+    # Chinese patterns
+    r'计算\s*([\d\s\+\-\*\/\^\(\)]+)',
+    r'([\d\s\+\-\*\/\^\(\)]+)等于多少',
+    r'([\d\s\+\-\*\/\^\(\)]+)是多少',
+))
+
+# "<number> <times word> <number>", checked before the general patterns
+MULTIPLICATION_PATTERN = re.compile(r'(\d+)\s*(x|×|times|multiplied by|乘|乘以|乘上|×上)\s*(\d+)', re.IGNORECASE)
+
+# Substrings of the casefolded query that any multiplication match contains; chosen to
+# avoid letters IGNORECASE also matches in other scripts (e.g. "i" and "ı")
+MULTIPLICATION_HINTS = ("x", "×", "乘", "mes", "mult")
+
+class ExpressionCharTable(dict):
+    """
+    str.translate table turning every character that cannot be part of an arithmetic
+    expression into a space (same set as the regex class [^\\d+\\-*/^().\\s])
+    
+    Entries for the Basic Multilingual Plane are filled in on first sight, so
+    translation runs in C once warmed up while the table stays bounded.
+    """
+    
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        keep = char.isdecimal() or char.isspace() or char in "+-*/^()."
+        replacement = codepoint if keep else ord(" ")
+        if codepoint < 0x10000:
+            self[codepoint] = replacement
+        return replacement
+
+EXPRESSION_CHAR_TABLE = ExpressionCharTable()
+
+# Bounds on ** so a query like 9**9**9 is rejected instead of blocking the event loop
+MAX_EXPONENT = 1000
+MAX_POWER_BITS = 100_000
+
+def checked_pow(base, exponent):
+    """operator.pow that refuses results too large to compute quickly"""
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"exponent too large: {exponent}")
+    if isinstance(base, int) and isinstance(exponent, int) and base.bit_length() * exponent > MAX_POWER_BITS:
+        raise ValueError("result too large")
+    return operator.pow(base, exponent)
+
+# Arithmetic allowed in expressions; anything else is rejected instead of executed
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Pow: checked_pow,
+}
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
 def extract_math_expression(query: str) -> Optional[str]:
     """
     Extract mathematical expression from query
@@ -33,42 +100,30 @@ def extract_math_expression(query: str) -> Optional[str]:
     Returns:
         Extracted expression or None
     """
-    # Try to extract mathematical expressions
-    patterns = [
-        r'calculate\s*([\d\s\+\-\*\/\^\(\)]+)',
-        r'([\d\s\+\-\*\/\^\(\)]+)equals',
-        r'([\d\s\+\-\*\/\^\(\)]+)is',
-        r'compute\s*([\d\s\+\-\*\/\^\(\)]+)',
-        # Chinese patterns
-        r'计算\s*([\d\s\+\-\*\/\^\(\)]+)',
-        r'([\d\s\+\-\*\/\^\(\)]+)等于多少',
-        r'([\d\s\+\-\*\/\^\(\)]+)是多少',
-    ]
-    
-    # Special handling for multiplication expressions
-    mult_pattern = r'(\d+)\s*(x|×|times|multiplied by|乘|乘以|乘上|×上)\s*(\d+)'
-    mult_match = re.search(mult_pattern, query, re.IGNORECASE)
+    # Special handling for multiplication expressions (skip the regex when no operator word is present)
+    folded_query = query.casefold()
+    mult_match = None
+    if any(hint in folded_query for hint in MULTIPLICATION_HINTS):
+        mult_match = MULTIPLICATION_PATTERN.search(query)
     if mult_match:
         num1 = mult_match.group(1)
         num2 = mult_match.group(3)  # Group number is 3 because the operator is group 2
         expression = f"{num1} * {num2}"
-        logger.info(f"Extracted multiplication expression: {expression}")
+        logger.debug("Extracted multiplication expression: %s", expression)
         return expression
     
     # Try other patterns
-    for pattern in patterns:
-        match = re.search(pattern, query, re.IGNORECASE)
+    for pattern in EXPRESSION_PATTERNS:
+        match = pattern.search(query)
         if match:
-            expression = match.group(1)
-            logger.info(f"Extracted expression: {expression}")
+            expression = match.group(1).replace('^', '**')  # Convert ^ to Python's ** operator
+            logger.debug("Extracted expression: %s", expression)
             return expression
             
-    # If no expression matched, try to extract math expression directly from query
-    expression = re.sub(r'[^\d\+\-\*\/\^\(\)\.\s]', ' ', query)
-    logger.info(f"No clear expression found, after cleaning: {expression}")
+    # If no expression matched, extract it directly from the query, keeping only numbers and operators
+    expression = query.translate(EXPRESSION_CHAR_TABLE)
+    logger.debug("No clear expression found, after cleaning: %s", expression)
     
-    # Clean the expression, keeping only numbers and operators
-    expression = re.sub(r'[^\d\+\-\*\/\^\(\)\.\s]', '', expression)
     expression = expression.replace('^', '**')  # Convert ^ to Python's ** operator
     expression = expression.strip()
     
@@ -77,6 +132,29 @@ def extract_math_expression(query: str) -> Optional[str]:
     
     return expression
 
+@lru_cache(maxsize=1024)
+def evaluate_expression(expression: str):
+    """
+    Evaluate an arithmetic expression by walking its syntax tree (results are memoized)
+    
+    Args:
+        expression: Expression of numbers, + - * / // ** and parentheses
+        
+    Returns:
+        The numeric result
+    """
+    return _evaluate_node(ast.parse(expression.strip(), mode="eval").body)
+
+def _evaluate_node(node: ast.AST):
+    """Evaluate a single node of an arithmetic expression tree"""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        return BINARY_OPERATORS[type(node.op)](_evaluate_node(node.left), _evaluate_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        return UNARY_OPERATORS[type(node.op)](_evaluate_node(node.operand))
+    raise ValueError(f"unsupported expression element: {type(node).__name__}")
+
 @mcp.tool()
 async def calculate(query: str) -> str:
     """
@@ -88,20 +166,20 @@ async def calculate(query: str) -> str:
     Returns:
         The calculation result or an error message
     """
-    logger.info(f"Processing math query: {query}")
+    logger.info("Processing math query: %s", query)
     
     # Extract expression
     expression = extract_math_expression(query)
     
-    logger.info(f"Final expression: {expression}")
+    logger.debug("Final expression: %s", expression)
     
     if not expression:
         return "Could not extract a valid mathematical expression"
     
     try:
         # Safe evaluation of the expression
-        result = eval(expression, {"__builtins__": {}}, {"math": math})
-        logger.info(f"Calculation result: {result}")
+        result = evaluate_expression(expression)
+        logger.debug("Calculation result: %s", result)
         
         # Format result
         if isinstance(result, int) or (isinstance(result, float) and result.is_integer()):
@@ -116,5 +194,5 @@ async def calculate(query: str) -> str:
         return error_msg
 
 if __name__ == "__main__":
-    # 启动MCP服务
-    mcp.run(transport="stdio") 
\ No newline at end of file
+    # 启动MCP服务 (MCP_TRANSPORT=sse serves on FASTMCP_HOST/FASTMCP_PORT so clients can share one server)
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "stdio")) 
\ No newline at end of file
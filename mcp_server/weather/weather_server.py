@@ -3,13 +3,16 @@
 Weather information tool server
 Provides weather information for locations around the world
 """
+import os
+import re
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from mcp.server.fastmcp import FastMCP
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
         logging.StreamHandler()
@@ -54,6 +57,19 @@ MOCK_WEATHER = {
     }
 }
 
+# Chinese display names for the mock locations
+LOCATION_DISPLAY_NAMES = {
+    "beijing": "北京",
+    "shanghai": "上海",
+    "new york": "纽约",
+    "london": "伦敦",
+    "tokyo": "东京"
+}
+
+# Every known location name in one pattern, so a query is scanned once
+LOCATION_PATTERN = re.compile("|".join(re.escape(location) for location in MOCK_WEATHER))
+
+@lru_cache(maxsize=512)
 def get_location_from_query(query: str) -> Optional[str]:
     """
     Extract location name from query
@@ -64,12 +80,8 @@ def get_location_from_query(query: str) -> Optional[str]:
     Returns:
         Location name or None
     """
-    query = query.lower()
-    for location in MOCK_WEATHER.keys():
-        if location in query:
-            return location
-    
-    return None
+    match = LOCATION_PATTERN.search(query.lower())
+    return match.group(0) if match else None
 
 @mcp.tool()
 async def get_weather(location: str) -> str:
@@ -82,36 +94,27 @@ async def get_weather(location: str) -> str:
     Returns:
         Weather information for the location
     """
-    logger.info(f"Getting weather for: {location}")
-    
-    # If query contains location info, extract it
-    if not location or location.strip() == "":
-        extracted_location = get_location_from_query(location)
-        if extracted_location:
-            location = extracted_location
+    logger.info("Getting weather for: %s", location)
     
     # Normalize location
     location = location.lower().strip()
     
     # Check if we have data for this location
-    weather_data = MOCK_WEATHER.get(location)
-    if weather_data:
-        return format_weather_response(location, weather_data)
+    weather_response = WEATHER_RESPONSES.get(location)
+    if weather_response:
+        return weather_response
+    
+    # Otherwise the argument may be a whole query ("weather in Tokyo today"); extract the location
+    extracted_location = get_location_from_query(location)
+    if extracted_location:
+        return WEATHER_RESPONSES[extracted_location]
     
     # Default response for unknown locations
     return f"抱歉，我没有关于 {location} 的天气信息。请尝试其他城市，如北京、上海、纽约、伦敦或东京。"
 
 def format_weather_response(location: str, weather: Dict[str, Any]) -> str:
     """Format weather data into a readable response"""
-    location_map = {
-        "beijing": "北京",
-        "shanghai": "上海",
-        "new york": "纽约",
-        "london": "伦敦",
-        "tokyo": "东京"
-    }
-    
-    display_name = location_map.get(location, location)
+    display_name = LOCATION_DISPLAY_NAMES.get(location, location)
     
     response = f"{display_name}天气信息：\n"
     response += f"天气状况: {weather['condition']}\n"
@@ -121,6 +124,12 @@ def format_weather_response(location: str, weather: Dict[str, Any]) -> str:
     
     return response
 
+# Weather data is static, so format each location's response once
+WEATHER_RESPONSES = {
+    location: format_weather_response(location, weather)
+    for location, weather in MOCK_WEATHER.items()
+}
+
 if __name__ == "__main__":
-    # 启动MCP服务
-    mcp.run(transport="stdio") 
\ No newline at end of file
+    # 启动MCP服务 (MCP_TRANSPORT=sse serves on FASTMCP_HOST/FASTMCP_PORT so clients can share one server)
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "stdio")) 
\ No newline at end of file